@@ -0,0 +1,52 @@
+"""store refresh token sha256 hashes
+
+Revision ID: 3b7e1d9f4a26
+Revises: 8d4e6b2a1c90
+Create Date: 2026-10-15 23:10:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e1d9f4a26'
+down_revision: Union[str, None] = '8d4e6b2a1c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """执行升级。"""
+    op.add_column(
+        'refresh_tokens',
+        sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True),
+    )
+    # 已有令牌就地计算摘要，升级后仍然可用
+    op.execute(
+        "UPDATE refresh_tokens SET token_hash = sha256(convert_to(token, 'UTF8'))"
+    )
+    op.alter_column('refresh_tokens', 'token_hash', nullable=False)
+    op.drop_index(op.f('ix_refresh_tokens_token'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token')
+    op.create_index(
+        op.f('ix_refresh_tokens_token_hash'),
+        'refresh_tokens',
+        ['token_hash'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """执行降级。"""
+    # 摘要无法还原为原始令牌，降级时删除所有刷新令牌，用户需要重新登录
+    op.execute("DELETE FROM refresh_tokens")
+    op.drop_index(op.f('ix_refresh_tokens_token_hash'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token_hash')
+    op.add_column(
+        'refresh_tokens',
+        sa.Column('token', sa.String(length=255), nullable=False),
+    )
+    op.create_index(op.f('ix_refresh_tokens_token'), 'refresh_tokens', ['token'], unique=True)
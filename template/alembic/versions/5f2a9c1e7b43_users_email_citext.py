@@ -0,0 +1,43 @@
+"""users email citext
+
+Revision ID: 5f2a9c1e7b43
+Revises: cbd3dddb6664
+Create Date: 2026-10-15 21:20:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2a9c1e7b43'
+down_revision: Union[str, None] = 'cbd3dddb6664'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """执行升级。"""
+    # 邮箱改为 CITEXT，不区分大小写的查询也能使用唯一索引
+    op.execute("CREATE EXTENSION IF NOT EXISTS citext")
+    op.alter_column(
+        'users',
+        'email',
+        existing_type=sa.String(length=255),
+        type_=postgresql.CITEXT(),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    """执行降级。"""
+    op.alter_column(
+        'users',
+        'email',
+        existing_type=postgresql.CITEXT(),
+        type_=sa.String(length=255),
+        existing_nullable=False,
+    )
@@ -0,0 +1,41 @@
+"""index users (created_at, id) for keyset pagination
+
+Revision ID: 6c1f8a3e5d72
+Revises: 3b7e1d9f4a26
+Create Date: 2026-10-15 23:40:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1f8a3e5d72'
+down_revision: Union[str, None] = '3b7e1d9f4a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """执行升级。"""
+    # (created_at, id) 复合索引同时支持按创建时间排序和游标分页，替换原有单列索引
+    op.create_index(
+        'ix_users_created_at_id_desc',
+        'users',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.drop_index('ix_users_created_at_desc', table_name='users')
+
+
+def downgrade() -> None:
+    """执行降级。"""
+    op.create_index(
+        'ix_users_created_at_desc',
+        'users',
+        [sa.text('created_at DESC')],
+        unique=False,
+    )
+    op.drop_index('ix_users_created_at_id_desc', table_name='users')
@@ -0,0 +1,39 @@
+"""drop duplicate pk indexes and index users created_at
+
+Revision ID: 8d4e6b2a1c90
+Revises: 5f2a9c1e7b43
+Create Date: 2026-10-15 21:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4e6b2a1c90'
+down_revision: Union[str, None] = '5f2a9c1e7b43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """执行升级。"""
+    # 主键本身已有唯一索引，删除重复的普通索引
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_refresh_tokens_id'), table_name='refresh_tokens')
+    # 支持用户列表按创建时间倒序分页
+    op.create_index(
+        'ix_users_created_at_desc',
+        'users',
+        [sa.text('created_at DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """执行降级。"""
+    op.drop_index('ix_users_created_at_desc', table_name='users')
+    op.create_index(op.f('ix_refresh_tokens_id'), 'refresh_tokens', ['id'], unique=False)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
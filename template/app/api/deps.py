@@ -5,7 +5,7 @@
 
 from typing import Annotated
 
-from fastapi import Depends, Header
+from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,6 +14,7 @@ from app.core.cache import get_redis
 from app.core.database import get_db
 from app.core.dependencies import get_request_id
 from app.models.user import User
+from app.schemas.token import TokenClaims
 from app.services.auth_service import AuthService
 
 # HTTP Bearer 认证
@@ -26,7 +27,7 @@ DatabaseDep = Annotated[AsyncSession, Depends(get_db)]
 RedisDep = Annotated[Redis, Depends(get_redis)]
 
 # 请求 ID 依赖
-RequestIDDep = Annotated[str, Depends(get_request_id)]
+RequestIDDep = Annotated[str, Depends(get_request_id, use_cache=True)]
 
 # 认证凭据依赖
 CredentialsDep = Annotated[HTTPAuthorizationCredentials, Depends(security)]
@@ -54,8 +55,12 @@ async def get_current_user(
     return await AuthService.get_current_user(db, redis=redis, token=credentials.credentials)
 
 
+# 当前用户依赖，同一请求内多个依赖共用时只解析一次
+_CurrentUser = Annotated[User, Depends(get_current_user, use_cache=True)]
+
+
 async def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: _CurrentUser,
 ) -> User:
     """获取当前活跃用户。
 
@@ -76,7 +81,7 @@ async def get_current_active_user(
 
 
 async def get_current_superuser(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: _CurrentUser,
 ) -> User:
     """获取当前超级管理员用户。
 
@@ -96,7 +101,61 @@ async def get_current_superuser(
     return current_user
 
 
+async def get_current_user_claims(
+    db: DatabaseDep,
+    redis: RedisDep,
+    credentials: CredentialsDep,
+) -> TokenClaims:
+    """获取当前用户的令牌声明。
+
+    只做权限检查的端点使用，不查询数据库；需要完整用户信息时使用 `get_current_user`。
+
+    Args:
+        db: 数据库会话。
+        redis: Redis 客户端。
+        credentials: HTTP Bearer 认证凭据。
+
+    Returns:
+        当前用户的令牌声明。
+
+    Raises:
+        AuthenticationException: 如果令牌无效、在黑名单中或账户已被禁用。
+    """
+    return await AuthService.get_current_user_claims(
+        db, redis=redis, token=credentials.credentials
+    )
+
+
+# 当前用户令牌声明依赖，同一请求内多个依赖共用时只解析一次
+_CurrentUserClaims = Annotated[TokenClaims, Depends(get_current_user_claims, use_cache=True)]
+
+
+async def get_current_superuser_claims(
+    claims: _CurrentUserClaims,
+) -> TokenClaims:
+    """获取当前超级管理员用户的令牌声明。
+
+    Args:
+        claims: 当前用户的令牌声明。
+
+    Returns:
+        当前超级管理员用户的令牌声明。
+
+    Raises:
+        PermissionException: 如果用户不是超级管理员。
+    """
+    if not claims.is_superuser:
+        from app.exceptions import PermissionException
+
+        raise PermissionException(message="权限不足")
+    return claims
+
+
 # 类型别名
-CurrentUserDep = Annotated[User, Depends(get_current_user)]
-CurrentActiveUserDep = Annotated[User, Depends(get_current_active_user)]
-CurrentSuperuserDep = Annotated[User, Depends(get_current_superuser)]
+CurrentUserDep = _CurrentUser
+CurrentActiveUserDep = Annotated[User, Depends(get_current_active_user, use_cache=True)]
+CurrentSuperuserDep = Annotated[User, Depends(get_current_superuser, use_cache=True)]
+CurrentUserClaimsDep = _CurrentUserClaims
+CurrentSuperuserClaimsDep = Annotated[
+    TokenClaims, Depends(get_current_superuser_claims, use_cache=True)
+]
@@ -3,7 +3,7 @@
 提供用户注册、登录、登出和令牌刷新等接口。
 """
 
-from fastapi import APIRouter, Header, status
+from fastapi import APIRouter, Header, Response, status
 
 from app.api.deps import CurrentUserDep, DatabaseDep, RedisDep
 from app.schemas.base import ApiResponse
@@ -35,7 +35,7 @@ async def register(
         包含用户信息的响应。
     """
     user = await AuthService.register(db, user_in=user_in)
-    return ApiResponse.success(data=UserResponse.model_validate(user))
+    return ApiResponse.success(data=UserResponse.from_orm_fast(user))
 
 
 @router.post(
@@ -123,13 +123,13 @@ async def logout(
 )
 async def get_current_user_info(
     current_user: CurrentUserDep,
-) -> ApiResponse[UserResponse]:
+) -> Response:
     """获取当前用户信息。
 
     Args:
         current_user: 当前用户实例。
 
     Returns:
-        包含用户信息的响应。
+        包含用户信息的响应，已预先序列化，跳过响应模型校验。
     """
-    return ApiResponse.success(data=UserResponse.model_validate(current_user))
+    return ApiResponse.success(data=UserResponse.from_orm_fast(current_user)).to_response()
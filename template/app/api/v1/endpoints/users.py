@@ -7,7 +7,13 @@ from typing import Annotated
 
 from fastapi import APIRouter, Query, Response, status
 
-from app.api.deps import CurrentSuperuserDep, CurrentUserDep, DatabaseDep
+from app.api.deps import (
+    CurrentSuperuserClaimsDep,
+    CurrentSuperuserDep,
+    CurrentUserDep,
+    DatabaseDep,
+    RedisDep,
+)
 from app.schemas.base import ApiResponse, PageResponse
 from app.schemas.user import UserResponse, UserUpdate
 from app.services.user_service import UserService
@@ -24,7 +30,7 @@ router = APIRouter()
 async def get_user_me(
     db: DatabaseDep,
     current_user: CurrentUserDep,
-) -> ApiResponse[UserResponse]:
+) -> Response:
     """获取当前用户信息。
 
     Args:
@@ -32,10 +38,10 @@ async def get_user_me(
         current_user: 当前用户实例。
 
     Returns:
-        包含用户信息的响应。
+        包含用户信息的响应，已预先序列化，跳过响应模型校验。
     """
     user = await UserService.get_user_me(db=db, current_user=current_user)
-    return ApiResponse.success(data=UserResponse.model_validate(user))
+    return ApiResponse.success(data=UserResponse.from_orm_fast(user)).to_response()
 
 
 @router.patch(
@@ -46,6 +52,7 @@ async def get_user_me(
 )
 async def update_user_me(
     db: DatabaseDep,
+    redis: RedisDep,
     current_user: CurrentUserDep,
     user_in: UserUpdate,
 ) -> ApiResponse[UserResponse]:
@@ -53,6 +60,7 @@ async def update_user_me(
 
     Args:
         db: 数据库会话。
+        redis: Redis 客户端。
         current_user: 当前用户实例。
         user_in: 更新数据。
 
@@ -60,9 +68,9 @@ async def update_user_me(
         包含更新后用户信息的响应。
     """
     user = await UserService.update_user_me(
-        db=db, current_user=current_user, user_in=user_in
+        db, redis, current_user=current_user, user_in=user_in
     )
-    return ApiResponse.success(data=UserResponse.model_validate(user))
+    return ApiResponse.success(data=UserResponse.from_orm_fast(user))
 
 
 @router.get(
@@ -74,20 +82,20 @@ async def update_user_me(
 async def get_user(
     db: DatabaseDep,
     user_id: str,
-    current_super_user: CurrentSuperuserDep,
-) -> ApiResponse[UserResponse]:
+    current_super_user: CurrentSuperuserClaimsDep,
+) -> Response:
     """获取用户信息。
 
     Args:
         db: 数据库会话。
         user_id: 用户 ID。
-        current_super_user: 当前超级管理员用户。
+        current_super_user: 当前超级管理员用户的令牌声明。
 
     Returns:
-        包含用户信息的响应。
+        包含用户信息的响应，已预先序列化，跳过响应模型校验。
     """
     user = await UserService.get_user(db, user_id=user_id)
-    return ApiResponse.success(data=UserResponse.model_validate(user))
+    return ApiResponse.success(data=UserResponse.from_orm_fast(user)).to_response()
 
 
 @router.patch(
@@ -98,6 +106,7 @@ async def get_user(
 )
 async def update_user(
     db: DatabaseDep,
+    redis: RedisDep,
     user_id: str,
     user_in: UserUpdate,
     current_super_user: CurrentSuperuserDep,
@@ -106,15 +115,16 @@ async def update_user(
 
     Args:
         db: 数据库会话。
+        redis: Redis 客户端。
         user_id: 用户 ID。
         user_in: 更新数据。
-        current_super_user: 当前超级管理员用户。
+        current_super_user: 当前超级管理员用户，修改类操作从数据库校验权限。
 
     Returns:
         包含更新后用户信息的响应。
     """
-    user = await UserService.update_user(db, user_id=user_id, user_in=user_in)
-    return ApiResponse.success(data=UserResponse.model_validate(user))
+    user = await UserService.update_user(db, redis, user_id=user_id, user_in=user_in)
+    return ApiResponse.success(data=UserResponse.from_orm_fast(user))
 
 
 @router.delete(
@@ -124,6 +134,7 @@ async def update_user(
 )
 async def delete_user(
     db: DatabaseDep,
+    redis: RedisDep,
     user_id: str,
     current_super_user: CurrentSuperuserDep,
 ) -> Response:
@@ -131,41 +142,50 @@ async def delete_user(
 
     Args:
         db: 数据库会话。
+        redis: Redis 客户端。
         user_id: 用户 ID。
-        current_super_user: 当前超级管理员用户。
+        current_super_user: 当前超级管理员用户，修改类操作从数据库校验权限。
 
     Returns:
         空响应，状态码 204。
     """
-    await UserService.delete_user(db, user_id=user_id)
+    await UserService.delete_user(db, redis, user_id=user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get(
     "",
-    response_model=ApiResponse[PageResponse],
+    response_model=ApiResponse[PageResponse[UserResponse]],
     summary="获取用户列表",
     description="分页获取用户列表",
 )
 async def get_users(
     db: DatabaseDep,
-    current_super_user: CurrentSuperuserDep,
+    current_super_user: CurrentSuperuserClaimsDep,
     skip: Annotated[int, Query(ge=0, description="跳过的记录数")] = 0,
     limit: Annotated[int, Query(ge=1, le=100, description="返回的记录数")] = 20,
-) -> ApiResponse[PageResponse]:
+    with_total: Annotated[bool, Query(description="是否统计总记录数")] = False,
+    cursor: Annotated[
+        str | None, Query(description="分页游标，传入上一页返回的 next_cursor")
+    ] = None,
+) -> Response:
     """获取用户列表。
 
     Args:
         db: 数据库会话。
-        current_super_user: 当前超级管理员用户。
+        current_super_user: 当前超级管理员用户的令牌声明。
         skip: 跳过的记录数。
         limit: 返回的记录数。
+        with_total: 是否统计总记录数，大表上统计总数代价较高，默认不统计。
+        cursor: 分页游标，传入时忽略 skip，按游标继续获取下一页。
 
     Returns:
-        包含用户列表的响应。
+        包含用户列表的响应，已预先序列化，跳过响应模型的逐行校验。
     """
     from app.core.config import settings
 
     limit = min(limit, settings.MAX_PAGE_SIZE)
-    page_data = await UserService.get_users(db, skip=skip, limit=limit)
-    return ApiResponse.success(data=page_data)
+    page_data = await UserService.get_users(
+        db, skip=skip, limit=limit, with_total=with_total, cursor=cursor
+    )
+    return ApiResponse.success(data=page_data).to_response()
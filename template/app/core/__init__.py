@@ -1,25 +1,36 @@
 """核心模块。"""
 
-from app.core.config import settings
+from app.core.config import get_settings, settings
 from app.core.database import async_session_maker, engine, get_db
 from app.core.logging import logger
+from app.core.responses import FastJSONResponse
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
     get_password_hash,
+    get_password_hash_async,
+    hash_token,
+    verify_and_update_password_async,
     verify_password,
+    verify_password_async,
 )
 
 __all__ = [
     "settings",
+    "get_settings",
     "logger",
+    "FastJSONResponse",
     "engine",
     "async_session_maker",
     "get_db",
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
+    "verify_and_update_password_async",
     "create_access_token",
     "create_refresh_token",
     "decode_token",
+    "hash_token",
 ]
@@ -1,16 +1,26 @@
 """缓存模块。
 
-提供 Redis 缓存连接和操作。
+提供 Redis 缓存连接和操作，基于 Redis 位图的布隆过滤器，以及进程内的本地 TTL 缓存。
 """
-from typing import AsyncGenerator
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
 
 from redis.asyncio import ConnectionPool, Redis
 
 from app.core.config import settings
 
+KT = TypeVar("KT")
+VT = TypeVar("VT")
+
 # Redis 连接池
 _redis_pool: ConnectionPool | None = None
 
+# 进程级 Redis 客户端
+_redis_client: Redis | None = None
+
 
 def get_redis_pool() -> ConnectionPool:
     """获取 Redis 连接池。
@@ -20,30 +30,256 @@ def get_redis_pool() -> ConnectionPool:
     """
     global _redis_pool
     if _redis_pool is None:
-        _redis_pool = ConnectionPool(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            password=settings.REDIS_PASSWORD,
-            db=settings.REDIS_DB,
+        _redis_pool = ConnectionPool.from_url(
+            settings.REDIS_URL,
             decode_responses=True,
+            health_check_interval=30,
         )
     return _redis_pool
 
 
-async def get_redis() -> AsyncGenerator[Redis, None]:
+async def get_redis() -> Redis:
     """获取 Redis 客户端。
 
-    Yields:
+    返回进程内共享的客户端，Redis 客户端可安全地被多个协程并发使用。
+    客户端不会在请求结束时关闭，只在应用关闭时由 `close_redis` 释放。
+
+    Returns:
         Redis 客户端。
     """
-    pool = get_redis_pool()
-    async with Redis(connection_pool=pool) as redis:
-        yield redis
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = Redis(connection_pool=get_redis_pool())
+    return _redis_client
 
 
 async def close_redis() -> None:
-    """关闭 Redis 连接池。"""
-    global _redis_pool
+    """关闭 Redis 客户端和连接池。"""
+    global _redis_client, _redis_pool
+    if _redis_client:
+        await _redis_client.aclose()
+        _redis_client = None
     if _redis_pool:
         await _redis_pool.aclose()
         _redis_pool = None
+
+
+async def unlink_by_pattern(
+    redis: Redis,
+    pattern: str,
+    *,
+    batch_size: int = 1000,
+) -> int:
+    """删除匹配模式的所有键。
+
+    使用 SCAN 增量遍历代替 KEYS，避免阻塞 Redis；删除使用 UNLINK，
+    由 Redis 后台线程回收内存，并通过管道每批只产生一次往返。
+
+    Args:
+        redis: Redis 客户端。
+        pattern: 键匹配模式，如 `"access_token_blacklist:*"`。
+        batch_size: 每批删除的键数量。
+
+    Returns:
+        删除的键数量。
+    """
+    deleted = 0
+    batch: list[str] = []
+
+    async def _flush() -> None:
+        nonlocal deleted
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.unlink(*batch)
+            results = await pipe.execute()
+        deleted += sum(results)
+        batch.clear()
+
+    async for key in redis.scan_iter(match=pattern, count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            await _flush()
+    if batch:
+        await _flush()
+    return deleted
+
+
+class BloomFilter:
+    """基于 Redis 位图的布隆过滤器。
+
+    使用 SETBIT/GETBIT 实现，不依赖 RedisBloom 模块，多个 worker 共享同一份位图。
+    `might_contain` 返回 False 表示元素一定不存在，返回 True 表示元素可能存在。
+    位图需要由调用方完整构建后调用 `mark_ready` 标记可用，未就绪时一律视为可能存在。
+
+    Attributes:
+        key: 位图的 Redis 键。
+        ready_key: 就绪标记的 Redis 键。
+        size: 位图位数。
+        hash_count: 每个元素使用的哈希函数个数。
+    """
+
+    def __init__(self, key: str, *, capacity: int, error_rate: float) -> None:
+        """初始化布隆过滤器。
+
+        Args:
+            key: 位图的 Redis 键。
+            capacity: 预期元素数量。
+            error_rate: 预期误判率。
+        """
+        self.key = key
+        self.ready_key = f"{key}:ready"
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+
+    def _offsets(self, item: str) -> list[int]:
+        """计算元素对应的位偏移量（双重哈希）。"""
+        digest = hashlib.sha256(item.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    async def add(self, redis: Redis, *items: str) -> None:
+        """添加元素。
+
+        Args:
+            redis: Redis 客户端。
+            *items: 要添加的元素。
+        """
+        async with redis.pipeline(transaction=False) as pipe:
+            for item in items:
+                for offset in self._offsets(item):
+                    pipe.setbit(self.key, offset, 1)
+            await pipe.execute()
+
+    async def might_contain(self, redis: Redis, *items: str) -> list[bool]:
+        """检查元素是否可能存在。
+
+        所有元素的检查合并为一次往返。
+
+        Args:
+            redis: Redis 客户端。
+            *items: 要检查的元素。
+
+        Returns:
+            与 `items` 一一对应的结果，False 表示一定不存在。
+        """
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.exists(self.ready_key)
+            for item in items:
+                for offset in self._offsets(item):
+                    pipe.getbit(self.key, offset)
+            ready, *bits = await pipe.execute()
+
+        if not ready:
+            return [True] * len(items)
+        return [
+            all(bits[i : i + self.hash_count])
+            for i in range(0, len(bits), self.hash_count)
+        ]
+
+    async def is_ready(self, redis: Redis) -> bool:
+        """检查位图是否已构建完成。
+
+        Args:
+            redis: Redis 客户端。
+
+        Returns:
+            是否已就绪。
+        """
+        return bool(await redis.exists(self.ready_key))
+
+    async def mark_ready(self, redis: Redis) -> None:
+        """标记位图已构建完成。
+
+        Args:
+            redis: Redis 客户端。
+        """
+        await redis.set(self.ready_key, "1")
+
+
+class TTLCache(Generic[KT, VT]):
+    """进程内 TTL 缓存。
+
+    条目在写入 ttl 秒后过期，超出容量时淘汰最久未访问的条目（LRU）。
+    缓存仅在当前进程内有效，多个 worker 之间不共享，也不是线程安全的，
+    只应在事件循环线程中使用。
+
+    Attributes:
+        maxsize: 最大条目数。
+        ttl: 默认过期时间（秒）。
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """初始化缓存。
+
+        Args:
+            maxsize: 最大条目数。
+            ttl: 默认过期时间（秒）。
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[KT, tuple[float, VT]] = OrderedDict()
+
+    def get(self, key: KT, default: VT | None = None) -> VT | None:
+        """获取缓存值。
+
+        Args:
+            key: 缓存键。
+            default: 未命中或已过期时返回的默认值。
+
+        Returns:
+            缓存值，如果不存在或已过期则返回默认值。
+        """
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: KT, value: VT, ttl: float | None = None) -> None:
+        """写入缓存值。
+
+        Args:
+            key: 缓存键。
+            value: 缓存值。
+            ttl: 过期时间（秒），为 None 时使用默认过期时间。
+        """
+        if ttl is None:
+            ttl = self.ttl
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: KT, default: VT | None = None) -> VT | None:
+        """移除缓存值。
+
+        Args:
+            key: 缓存键。
+            default: 不存在时返回的默认值。
+
+        Returns:
+            被移除的缓存值，如果不存在则返回默认值。
+        """
+        item = self._data.pop(key, None)
+        if item is None:
+            return default
+        return item[1]
+
+    def clear(self) -> None:
+        """清空缓存。"""
+        self._data.clear()
+
+    def __contains__(self, key: object) -> bool:
+        """检查键是否存在且未过期。"""
+        return self.get(key) is not None  # type: ignore[arg-type]
+
+    def __len__(self) -> int:
+        """返回缓存条目数（可能包含尚未清理的过期条目）。"""
+        return len(self._data)
@@ -0,0 +1,45 @@
+"""缓存键模块。
+
+集中定义 Redis 缓存键的命名，保持键名可组合，便于按前缀批量失效。
+"""
+
+
+class CacheKeys:
+    """Redis 缓存键命名。
+
+    Attributes:
+        USER_PREFIX: 用户相关缓存键前缀。
+        USER_INVALIDATE_CHANNEL: 用户缓存失效通知的发布/订阅频道。
+        USER_BLOOM: 已注册邮箱、用户名的布隆过滤器位图。不放在 `USER_PREFIX` 下，
+            按前缀批量清理用户缓存时不会连带删除需要从数据库重建的位图。
+    """
+
+    USER_PREFIX = "user:"
+    USER_INVALIDATE_CHANNEL = "user:invalidate"
+    USER_BLOOM = "bloom:user"
+
+    @staticmethod
+    def user_by_email(email: str) -> str:
+        """按邮箱查询用户的缓存键。
+
+        邮箱不区分大小写，统一转为小写，同一邮箱的不同写法共用一个缓存键。
+
+        Args:
+            email: 用户邮箱。
+
+        Returns:
+            缓存键。
+        """
+        return f"{CacheKeys.USER_PREFIX}email:{email.lower()}"
+
+    @staticmethod
+    def user_by_username(username: str) -> str:
+        """按用户名查询用户的缓存键。
+
+        Args:
+            username: 用户名。
+
+        Returns:
+            缓存键。
+        """
+        return f"{CacheKeys.USER_PREFIX}username:{username}"
@@ -4,11 +4,16 @@
 """
 
 import secrets
+from functools import cached_property, lru_cache
 from typing import Literal
+from urllib.parse import quote
 
-from pydantic import Field, field_validator
+from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# .env.example 中的占位密钥
+_PLACEHOLDER_SECRET_KEY = "your-secret-key-here-change-in-production"
+
 
 class Settings(BaseSettings):
     """应用程序配置类。
@@ -40,21 +45,32 @@ class Settings(BaseSettings):
 
     # 安全配置
     SECRET_KEY: str = Field(
-        default=secrets.token_urlsafe(32),
+        default_factory=lambda: secrets.token_urlsafe(32),
         description="JWT 密钥（生产环境必须从环境变量设置）",
     )
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(
-        default=30, description="访问令牌过期时间（分钟）"
+        default=15,
+        description="访问令牌过期时间（分钟）。只读的管理接口直接信任令牌中的权限声明，"
+        "账户被禁用或取消管理员权限后，已签发的令牌在过期前仍可访问这些接口",
     )
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(
         default=7, description="刷新令牌过期时间（天）"
     )
     ALGORITHM: str = Field(default="HS256", description="JWT 算法")
+    REFRESH_TOKEN_PURGE_BATCH_SIZE: int = Field(
+        default=10000, description="清理过期刷新令牌时每批删除的记录数"
+    )
 
     # 密码配置
+    PASSWORD_HASHER: Literal["bcrypt", "argon2"] = Field(
+        default="argon2", description="密码哈希算法"
+    )
     PASSWORD_BCRYPT_ROUNDS: int = Field(
         default=12, description="密码 bcrypt 加密轮数"
     )
+    PASSWORD_HASH_WORKERS: int | None = Field(
+        default=None, description="密码哈希线程数，默认为 CPU 核数"
+    )
 
     # 数据库配置
     POSTGRES_HOST: str = Field(default="localhost", description="PostgreSQL 主机")
@@ -63,9 +79,20 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = Field(default="postgres", description="PostgreSQL 密码")
     POSTGRES_DB: str = Field(default="mydb", description="PostgreSQL 数据库名")
 
-    @property
+    # 数据库连接池配置
+    DB_POOL_SIZE: int = Field(default=20, description="数据库连接池大小")
+    DB_MAX_OVERFLOW: int = Field(default=10, description="数据库连接池最大溢出连接数")
+    DB_POOL_RECYCLE: int = Field(
+        default=60, description="数据库连接回收时间（秒），-1 表示不回收"
+    )
+    DB_POOL_TIMEOUT: int = Field(default=30, description="获取数据库连接超时时间（秒）")
+    DB_POOL_PRE_PING: bool = Field(
+        default=False, description="取出连接前是否执行连通性检查"
+    )
+
+    @cached_property
     def DATABASE_URL(self) -> str:
-        """获取数据库连接 URL."""
+        """获取数据库连接 URL（首次访问时构建并缓存）。"""
         return (
             f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
@@ -77,6 +104,12 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: str | None = Field(default=None, description="Redis 密码")
     REDIS_DB: int = Field(default=0, description="Redis 数据库编号")
 
+    @cached_property
+    def REDIS_URL(self) -> str:
+        """获取 Redis 连接 URL（首次访问时构建并缓存）。"""
+        auth = f":{quote(self.REDIS_PASSWORD, safe='')}@" if self.REDIS_PASSWORD else ""
+        return f"redis://{auth}{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
+
     # RabbitMQ 配置
     RABBITMQ_HOST: str = Field(default="localhost", description="RabbitMQ 主机")
     RABBITMQ_PORT: int = Field(default=5672, description="RabbitMQ 端口")
@@ -84,6 +117,16 @@ class Settings(BaseSettings):
     RABBITMQ_PASSWORD: str = Field(default="guest", description="RabbitMQ 密码")
     RABBITMQ_VHOST: str = Field(default="/", description="RabbitMQ 虚拟主机")
 
+    @cached_property
+    def RABBITMQ_URL(self) -> str:
+        """获取 RabbitMQ 连接 URL（首次访问时构建并缓存）。"""
+        return (
+            f"amqp://{quote(self.RABBITMQ_USER, safe='')}:"
+            f"{quote(self.RABBITMQ_PASSWORD, safe='')}"
+            f"@{self.RABBITMQ_HOST}:{self.RABBITMQ_PORT}/"
+            f"{quote(self.RABBITMQ_VHOST, safe='')}"
+        )
+
     # MinIO 配置
     MINIO_ENDPOINT: str = Field(default="localhost:9000", description="MinIO 端点")
     MINIO_ACCESS_KEY: str = Field(default="minioadmin", description="MinIO 访问密钥")
@@ -99,11 +142,85 @@ class Settings(BaseSettings):
 
     # 日志配置
     LOG_LEVEL: str = Field(default="INFO", description="日志级别")
+    LOG_TO_FILE: bool = Field(default=False, description="是否同时写入日志文件")
+    SLOW_REQUEST_MS: int = Field(
+        default=500, description="慢请求阈值（毫秒），超过时记录警告日志"
+    )
 
     # 分页配置
     DEFAULT_PAGE_SIZE: int = Field(default=20, description="默认分页大小")
     MAX_PAGE_SIZE: int = Field(default=100, description="最大分页大小")
 
+    # Redis 缓存配置
+    USER_LOOKUP_CACHE_TTL: int = Field(
+        default=120, description="按邮箱/用户名查询用户的 Redis 缓存过期时间（秒）"
+    )
+    USER_BLOOM_CAPACITY: int = Field(
+        default=2_000_000,
+        description="已注册邮箱、用户名布隆过滤器的预期元素数（每个用户两个元素）",
+    )
+    USER_BLOOM_ERROR_RATE: float = Field(
+        default=0.01, description="已注册邮箱、用户名布隆过滤器的误判率"
+    )
+
+    # 本地缓存配置
+    CURRENT_USER_CACHE_TTL: int = Field(
+        default=30, description="当前用户本地缓存过期时间（秒）"
+    )
+    CURRENT_USER_CACHE_MAXSIZE: int = Field(
+        default=10000, description="当前用户本地缓存最大条目数"
+    )
+    DECODED_TOKEN_CACHE_TTL: int = Field(
+        default=30, description="令牌解码结果本地缓存过期时间（秒）"
+    )
+    DECODED_TOKEN_CACHE_MAXSIZE: int = Field(
+        default=10000, description="令牌解码结果本地缓存最大条目数"
+    )
+    LOGIN_CACHE_TTL: int = Field(
+        default=10, description="登录成功凭据本地缓存过期时间（秒）"
+    )
+    LOGIN_CACHE_MAXSIZE: int = Field(
+        default=5000, description="登录成功凭据本地缓存最大条目数"
+    )
+    TOKEN_BLACKLIST_CACHE_TTL: int = Field(
+        default=30, description="令牌黑名单本地缓存过期时间（秒）"
+    )
+    TOKEN_BLACKLIST_CACHE_MAXSIZE: int = Field(
+        default=50000, description="令牌黑名单本地缓存最大条目数"
+    )
+    USER_LOOKUP_LOCAL_CACHE_TTL: int = Field(
+        default=30, description="按邮箱/用户名查询用户的本地缓存过期时间（秒）"
+    )
+    USER_LOOKUP_LOCAL_CACHE_MAXSIZE: int = Field(
+        default=10000, description="按邮箱/用户名查询用户的本地缓存最大条目数"
+    )
+
+    @model_validator(mode="after")
+    def _require_secret_key_in_production(self) -> "Settings":
+        """生产环境必须显式配置 SECRET_KEY。
+
+        随机生成的密钥在每个进程中都不同，多 worker 部署时一个 worker 签发的令牌
+        无法被其他 worker 验证，重启后所有令牌也会失效。
+        """
+        if self.ENVIRONMENT == "production" and (
+            "SECRET_KEY" not in self.model_fields_set
+            or self.SECRET_KEY == _PLACEHOLDER_SECRET_KEY
+        ):
+            raise ValueError("生产环境必须通过环境变量设置 SECRET_KEY")
+        return self
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """获取配置实例。
+
+    配置只在首次调用时构建，测试中可通过 `get_settings.cache_clear()` 重新加载。
+
+    Returns:
+        配置实例。
+    """
+    return Settings()
+
 
 # 全局配置实例
-settings = Settings()
+settings = get_settings()
@@ -11,12 +11,16 @@ from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from app.core.config import settings
 
 # 创建异步数据库引擎
+# 默认关闭 pre-ping：它会为每次取出连接增加一次往返，并且在 PgBouncer 事务模式下
+# 会留下 "idle in transaction" 的后端连接；改用 pool_recycle 定期回收连接
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
 )
 
 # 创建异步会话工厂
@@ -42,10 +46,9 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         ```
     """
     async with async_session_maker() as session:
+        # 不在此处自动提交：只读请求无需 COMMIT，写操作由服务层显式提交
         try:
             yield session
-            # 成功后提交事务
-            await session.commit()
         except Exception:
             # 失败时回滚事务
             await session.rollback()
@@ -4,28 +4,31 @@
 """
 
 from collections.abc import AsyncGenerator
+from uuid import uuid4
 
-from fastapi import Depends, Header
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.logging import logger
 
 
-async def get_request_id(x_request_id: str | None = Header(None)) -> str:
+async def get_request_id(request: Request) -> str:
     """获取或生成请求 ID。
 
+    优先复用 `RequestIdMiddleware` 写入 scope 的请求 ID，
+    未启用该中间件时再从请求头读取。
+
     Args:
-        x_request_id: 请求头中的请求 ID。
+        request: 请求对象。
 
     Returns:
         请求 ID 字符串。
     """
-    if x_request_id:
-        return x_request_id
-    import uuid
-
-    return str(uuid.uuid4())
+    request_id = request.scope.get("request_id") or request.headers.get("x-request-id")
+    if request_id:
+        return request_id
+    return str(uuid4())
 
 
 class RequestIdMiddleware:
@@ -48,15 +51,14 @@ class RequestIdMiddleware:
             send: ASGI send callable。
         """
         if scope["type"] == "http":
-            # 从请求头中获取 request_id
-            headers = dict(scope.get("headers", []))
-            request_id = headers.get(b"x-request-id")
-            if request_id:
-                request_id = request_id.decode()
-            else:
-                import uuid
-
-                request_id = str(uuid.uuid4())
+            # 从请求头中获取 request_id，找到后立即停止扫描，无需构建完整的请求头字典
+            request_id = None
+            for key, value in scope.get("headers", ()):
+                if key == b"x-request-id":
+                    request_id = value.decode("latin-1")
+                    break
+            if not request_id:
+                request_id = str(uuid4())
 
             # 将 request_id 添加到 scope
             scope["request_id"] = request_id
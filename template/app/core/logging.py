@@ -4,12 +4,17 @@
 """
 
 import sys
+from contextvars import ContextVar
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from loguru import logger as _logger
 
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from loguru import Record
+
 
 def setup_logging() -> None:
     """配置应用程序日志。
@@ -25,7 +30,7 @@ def setup_logging() -> None:
         "<level>{level: <8}</level> | "
         "<cyan>{extra[request_id]}</cyan> | "
         "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
-        "<level>{message}</level>"
+        "<level>{message}</level>\n{exception}"
     )
 
     # 添加默认 request_id 的日志格式化器
@@ -35,15 +40,31 @@ def setup_logging() -> None:
             record["extra"]["request_id"] = "N/A"
         return log_format
 
-    # 添加控制台处理器
-    _logger.add(
-        sys.stdout,
-        format=formatter,
-        level=settings.LOG_LEVEL,
-        colorize=True,
-        backtrace=True,
-        diagnose=True,
-    )
+    # 添加控制台处理器，日志 I/O 通过 enqueue 交给后台线程，不阻塞事件循环
+    if settings.ENVIRONMENT == "production":
+        # 生产环境输出 JSON 结构化日志，便于日志采集系统解析
+        _logger.add(
+            sys.stdout,
+            format="{message}",
+            level=settings.LOG_LEVEL,
+            serialize=True,
+            enqueue=True,
+            backtrace=True,
+            diagnose=False,
+        )
+    else:
+        _logger.add(
+            sys.stdout,
+            format=formatter,
+            level=settings.LOG_LEVEL,
+            colorize=True,
+            enqueue=True,
+            backtrace=True,
+            diagnose=True,
+        )
+
+    if not settings.LOG_TO_FILE:
+        return
 
     # 添加文件处理器（按日期轮转）
     log_path = Path("logs")
@@ -56,6 +77,7 @@ def setup_logging() -> None:
         rotation="00:00",  # 每天午夜轮转
         retention="30 days",  # 保留 30 天
         compression="zip",  # 压缩旧日志
+        enqueue=True,
         backtrace=True,
         diagnose=True,
     )
@@ -68,13 +90,23 @@ def setup_logging() -> None:
         rotation="00:00",
         retention="30 days",
         compression="zip",
+        enqueue=True,
         backtrace=True,
         diagnose=True,
     )
 
 
+# 当前请求 ID，由日志中间件在请求开始时设置
+request_id_var: ContextVar[str] = ContextVar("request_id", default="N/A")
+
+
+def _patch_request_id(record: "Record") -> None:
+    """为未显式绑定 request_id 的日志记录补充当前请求 ID。"""
+    record["extra"].setdefault("request_id", request_id_var.get())
+
+
 # 初始化日志配置
 setup_logging()
 
-# 导出 logger，绑定默认的 request_id
-logger = _logger.bind(request_id="N/A")
+# 导出 logger，自动附带当前请求 ID
+logger = _logger.patch(_patch_request_id)
@@ -0,0 +1,28 @@
+"""响应模块。
+
+定义应用默认使用的 JSON 响应类。
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """基于 pydantic-core 序列化的 JSON 响应。
+
+    使用 pydantic-core 的 Rust 序列化器代替标准库 `json.dumps`，
+    输出紧凑的 UTF-8 JSON，并原生支持 UUID、datetime 等类型。
+    """
+
+    def render(self, content: Any) -> bytes:
+        """将响应内容序列化为 JSON 字节。
+
+        Args:
+            content: 响应内容。
+
+        Returns:
+            JSON 字节串。
+        """
+        return to_json(content, inf_nan_mode="null")
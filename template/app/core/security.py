@@ -3,6 +3,10 @@
 包含 JWT 令牌处理和密码加密功能。
 """
 
+import asyncio
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -15,8 +19,30 @@ from app.core.config import settings
 # 类型别名，保持向后兼容
 JWTError = InvalidTokenError
 
-# 密码加密上下文
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 密码加密上下文，首个算法用于生成新哈希，其余算法仅用于校验已有哈希
+_PASSWORD_SCHEMES = [settings.PASSWORD_HASHER] + [
+    scheme for scheme in ("bcrypt", "argon2") if scheme != settings.PASSWORD_HASHER
+]
+pwd_context = CryptContext(
+    schemes=_PASSWORD_SCHEMES,
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=2,
+)
+
+# 密码哈希专用线程池。bcrypt 和 argon2 在计算时都会释放 GIL，线程即可利用多核；
+# 使用独立线程池避免大量登录请求占满默认线程池，影响其他 to_thread 调用
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    thread_name_prefix="password-hash",
+)
+
+# JWT 签名密钥和解码参数，在模块加载时计算一次，避免每次编解码重复构建
+_SECRET_KEY_BYTES = settings.SECRET_KEY.encode()
+_ALGORITHMS = (settings.ALGORITHM,)
+_DECODE_OPTIONS = {"require": ["exp", "sub", "type"]}
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -44,15 +70,71 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """在线程池中验证密码。
+
+    密码哈希计算是 CPU 密集型操作，放到专用线程池中执行以免阻塞事件循环。
+
+    Args:
+        plain_password: 明文密码。
+        hashed_password: 哈希后的密码。
+
+    Returns:
+        密码是否匹配。
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, pwd_context.verify, plain_password, hashed_password
+    )
+
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str,
+) -> tuple[bool, str | None]:
+    """在线程池中验证密码，并在哈希已过时生成新的哈希。
+
+    旧算法（如从 bcrypt 切换到 argon2 前生成的哈希）或旧参数生成的哈希验证通过后，
+    会返回使用当前算法重新生成的哈希，调用方应将其保存以逐步完成迁移。
+
+    Args:
+        plain_password: 明文密码。
+        hashed_password: 哈希后的密码。
+
+    Returns:
+        (密码是否匹配, 新的哈希值) 元组，哈希无需更新时新的哈希值为 None。
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """在线程池中获取密码哈希值。
+
+    Args:
+        password: 明文密码。
+
+    Returns:
+        哈希后的密码。
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, pwd_context.hash, password)
+
+
 def create_access_token(
     subject: str | Any,
     expires_delta: timedelta | None = None,
+    *,
+    claims: dict[str, Any] | None = None,
 ) -> str:
     """创建访问令牌。
 
     Args:
         subject: 令牌主题（通常是用户 ID）。
         expires_delta: 过期时间增量。
+        claims: 额外写入令牌的声明，不能覆盖 sub/exp/type。
 
     Returns:
         JWT 访问令牌。
@@ -64,10 +146,8 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode = {"sub": str(subject), "exp": expire, "type": "access"}
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
+    to_encode = {**(claims or {}), "sub": str(subject), "exp": expire, "type": "access"}
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
@@ -92,12 +172,24 @@ def create_refresh_token(
         )
 
     to_encode = {"sub": str(subject), "exp": expire, "type": "refresh"}
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
+def hash_token(token: str) -> bytes:
+    """计算令牌的 SHA-256 摘要。
+
+    数据库中只保存刷新令牌的摘要，索引更小，且数据库泄露时无法直接得到可用令牌。
+
+    Args:
+        token: JWT 令牌。
+
+    Returns:
+        32 字节的令牌摘要。
+    """
+    return hashlib.sha256(token.encode()).digest()
+
+
 def decode_token(token: str) -> dict[str, Any] | None:
     """解码令牌。
 
@@ -105,11 +197,14 @@ def decode_token(token: str) -> dict[str, Any] | None:
         token: JWT 令牌。
 
     Returns:
-        解码后的令牌数据，如果令牌无效则返回 None。
+        解码后的令牌数据，如果令牌无效或缺少 exp/sub/type 声明则返回 None。
     """
     try:
         payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            token,
+            _SECRET_KEY_BYTES,
+            algorithms=_ALGORITHMS,
+            options=_DECODE_OPTIONS,
         )
         return payload
     except JWTError:
@@ -4,12 +4,14 @@
 """
 
 import uuid
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel
-from sqlalchemy import Select, UnaryExpression, select
+from sqlalchemy import Row, Select, UnaryExpression, bindparam, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, make_transient_to_detached
+from sqlalchemy.orm.interfaces import ORMOption
 
 from app.models.base import Base
 
@@ -17,6 +19,26 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# 只查询部分列时传入的列属性，如 `(User.id, User.email)`
+ColumnsType = Sequence[InstrumentedAttribute[Any]]
+
+# 排序条件，单个排序表达式或按优先级排列的多个表达式，如 `(desc(User.created_at), desc(User.id))`
+OrderByType = UnaryExpression[Any] | Sequence[UnaryExpression[Any]]
+
+
+def _order_by_clauses(order_by: OrderByType) -> tuple[UnaryExpression[Any], ...]:
+    """将排序条件统一为表达式元组。
+
+    Args:
+        order_by: 排序条件。
+
+    Returns:
+        排序表达式元组。
+    """
+    if isinstance(order_by, UnaryExpression):
+        return (order_by,)
+    return tuple(order_by)
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """基础 CRUD 类。
@@ -34,24 +56,32 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             model: SQLAlchemy 模型类。
         """
         self.model = model
+        # 模型列名集合，用于 O(1) 判断字段是否为有效列
+        self._columns: frozenset[str] = frozenset(model.__mapper__.column_attrs.keys())
+        # 按查询字段组合缓存的 get_by 语句，条件值通过绑定参数传入
+        self._get_by_statements: dict[frozenset[str], Select[tuple[ModelType]]] = {}
 
     async def get(
         self,
         db: AsyncSession,
         id: uuid.UUID,
+        *,
+        options: Sequence[ORMOption] | None = None,
     ) -> ModelType | None:
         """根据 ID 获取单个记录。
 
+        优先从会话的标识映射中查找，同一会话内重复读取同一记录不会再次查询数据库。
+
         Args:
             db: 数据库会话。
             id: 记录 ID。
+            options: 加载选项，如 `selectinload(Model.relation)`，用于预先批量加载
+                调用方随后会访问的关联关系，避免逐条懒加载产生 N+1 查询。
 
         Returns:
             模型实例，如果不存在则返回 None。
         """
-        statement = select(self.model).where(self.model.id == id)
-        result = await db.execute(statement)
-        return result.scalar_one_or_none()
+        return await db.get(self.model, id, options=options)
 
     async def get_by(
         self,
@@ -72,38 +102,177 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             user = await user_repo.get_by(db, email="user@example.com")
             ```
         """
-        statement = select(self.model)
-        for key, value in kwargs.items():
-            if hasattr(self.model, key):
-                statement = statement.where(getattr(self.model, key) == value)
-        result = await db.execute(statement)
+        params = {key: value for key, value in kwargs.items() if key in self._columns}
+        result = await db.execute(self._get_by_statement(frozenset(params)), params)
         return result.scalar_one_or_none()
 
+    def _get_by_statement(self, keys: frozenset[str]) -> Select[tuple[ModelType]]:
+        """获取按指定字段组合查询的语句。
+
+        每种字段组合只构建一次语句，之后直接复用，省去每次调用重新构建查询的开销。
+
+        Args:
+            keys: 查询字段名集合。
+
+        Returns:
+            以字段名作为绑定参数名的查询语句。
+        """
+        statement = self._get_by_statements.get(keys)
+        if statement is None:
+            statement = select(self.model).where(
+                *[getattr(self.model, key) == bindparam(key) for key in keys]
+            )
+            self._get_by_statements[keys] = statement
+        return statement
+
     async def get_multi(
         self,
         db: AsyncSession,
         *,
         skip: int = 0,
         limit: int = 100,
-        order_by: UnaryExpression[Any] | None = None,
-    ) -> Sequence[ModelType]:
+        order_by: OrderByType | None = None,
+        columns: ColumnsType | None = None,
+    ) -> Sequence[ModelType] | Sequence[Row[Any]]:
         """获取多个记录。
 
+        结果会一次性加载到内存中，适用于有限大小的分页查询；
+        需要遍历大量记录时请使用 `iter_multi`。
+
         Args:
             db: 数据库会话。
             skip: 跳过的记录数。
             limit: 返回的最大记录数。
             order_by: 排序条件。
+            columns: 只查询的列，指定时返回按列名访问的行而不是模型实例。
 
         Returns:
-            模型实例列表。
+            模型实例列表，指定 `columns` 时为行列表。
         """
-        statement = select(self.model)
+        statement = self._select(columns)
         if order_by is not None:
-            statement = statement.order_by(order_by)
+            statement = statement.order_by(*_order_by_clauses(order_by))
         statement = statement.offset(skip).limit(limit)
         result = await db.execute(statement)
-        return result.scalars().all()
+        return result.all() if columns else result.scalars().all()
+
+    async def iter_multi(
+        self,
+        db: AsyncSession,
+        *,
+        chunk_size: int = 256,
+        order_by: OrderByType | None = None,
+    ) -> AsyncIterator[ModelType]:
+        """流式遍历所有记录。
+
+        使用服务端游标按批次拉取，内存中同时存在的模型实例不超过一个批次，
+        适用于数据导出、批量处理等需要遍历大量记录的场景。
+
+        Args:
+            db: 数据库会话。
+            chunk_size: 每批拉取的记录数。
+            order_by: 排序条件。
+
+        Yields:
+            模型实例。
+
+        Examples:
+            ```python
+            async for user in user_repo.iter_multi(db, chunk_size=500):
+                writer.writerow([user.id, user.email])
+            ```
+        """
+        statement = select(self.model).execution_options(yield_per=chunk_size)
+        if order_by is not None:
+            statement = statement.order_by(*_order_by_clauses(order_by))
+        result = await db.stream_scalars(statement)
+        async for db_obj in result:
+            yield db_obj
+
+    async def get_multi_with_total(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        order_by: OrderByType | None = None,
+        columns: ColumnsType | None = None,
+    ) -> tuple[list[Any], int]:
+        """获取多个记录及记录总数。
+
+        通过 `COUNT(*) OVER ()` 窗口函数在同一条查询中返回总数，
+        分页时无需再单独执行一次 COUNT 查询。
+
+        Args:
+            db: 数据库会话。
+            skip: 跳过的记录数。
+            limit: 返回的最大记录数。
+            order_by: 排序条件。
+            columns: 只查询的列，指定时返回按列名访问的行而不是模型实例。
+
+        Returns:
+            (模型实例列表, 记录总数) 元组，指定 `columns` 时为行列表。
+        """
+        statement = self._select(columns).add_columns(func.count().over().label("total"))
+        if order_by is not None:
+            statement = statement.order_by(*_order_by_clauses(order_by))
+        statement = statement.offset(skip).limit(limit)
+        result = await db.execute(statement)
+        rows = result.all()
+        if not rows:
+            # 页码越界时窗口函数没有返回行，退回到单独统计
+            total = await self.count(db) if skip > 0 else 0
+            return [], total
+        # 只查询部分列时直接返回行，行中多出的 total 列不影响按列名取值
+        items = list(rows) if columns else [row[0] for row in rows]
+        return items, rows[0].total
+
+    async def get_multi_plus_one(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        order_by: OrderByType | None = None,
+        columns: ColumnsType | None = None,
+    ) -> tuple[list[Any], bool]:
+        """获取多个记录及是否还有更多记录。
+
+        多取一条记录判断是否存在下一页，不统计总数，
+        大表分页时可避免代价较高的 COUNT 查询。
+
+        Args:
+            db: 数据库会话。
+            skip: 跳过的记录数。
+            limit: 返回的最大记录数。
+            order_by: 排序条件。
+            columns: 只查询的列，指定时返回按列名访问的行而不是模型实例。
+
+        Returns:
+            (模型实例列表, 是否还有更多记录) 元组，指定 `columns` 时为行列表。
+        """
+        statement = self._select(columns)
+        if order_by is not None:
+            statement = statement.order_by(*_order_by_clauses(order_by))
+        statement = statement.offset(skip).limit(limit + 1)
+        result = await db.execute(statement)
+        items = list(result.all() if columns else result.scalars().all())
+        return items[:limit], len(items) > limit
+
+    def _select(self, columns: ColumnsType | None) -> Select[Any]:
+        """构建查询语句，指定列时只查询这些列。
+
+        只查询部分列时跳过 ORM 实例的构建，适用于只读的列表查询。
+
+        Args:
+            columns: 只查询的列，为 None 时查询完整的模型。
+
+        Returns:
+            查询语句。
+        """
+        if columns:
+            return select(*columns)
+        return select(self.model)
 
     async def create(
         self,
@@ -140,6 +309,9 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> ModelType:
         """更新记录。
 
+        通过单条 `UPDATE ... RETURNING` 语句写入并取回最新的行，
+        无需先 flush 再 refresh，只产生一次数据库往返。
+
         Args:
             db: 数据库会话。
             db_obj: 要更新的数据库模型实例。
@@ -153,13 +325,21 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
 
-        for field, value in update_data.items():
-            if hasattr(db_obj, field):
-                setattr(db_obj, field, value)
-
-        await db.flush()
-        await db.refresh(db_obj)
-        return db_obj
+        values = {
+            field: value for field, value in update_data.items() if field in self._columns
+        }
+        if not values:
+            return db_obj
+
+        statement = (
+            update(self.model)
+            .where(self.model.id == db_obj.id)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(statement)
+        return result.scalar_one()
 
     async def delete(
         self,
@@ -183,6 +363,40 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         await db.flush()
         return obj
 
+    def snapshot(self, db_obj: ModelType) -> dict[str, Any]:
+        """导出模型实例的列值快照。
+
+        快照只包含列值，可安全地跨会话缓存。
+
+        Args:
+            db_obj: 模型实例。
+
+        Returns:
+            列名到列值的字典。
+        """
+        return {key: getattr(db_obj, key) for key in self._columns}
+
+    async def attach(
+        self,
+        db: AsyncSession,
+        *,
+        data: dict[str, Any],
+    ) -> ModelType:
+        """根据列值快照重建实例并挂载到会话。
+
+        不会发出任何 SQL，重建的实例被视为已从数据库加载，后续修改可正常 flush。
+
+        Args:
+            db: 数据库会话。
+            data: 由 `snapshot` 导出的列值快照。
+
+        Returns:
+            挂载到当前会话的模型实例。
+        """
+        db_obj = self.model(**data)
+        make_transient_to_detached(db_obj)
+        return await db.merge(db_obj, load=False)
+
     async def count(
         self,
         db: AsyncSession,
@@ -198,10 +412,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             记录数。
         """
+        # 统计所有记录时直接对表计数，不包装子查询，也不构建任何实例
         if statement is None:
-            statement = select(self.model)
-        from sqlalchemy import func
-
-        count_statement = select(func.count()).select_from(statement)
+            count_statement = select(func.count()).select_from(self.model)
+        else:
+            count_statement = select(func.count()).select_from(statement.subquery())
         result = await db.execute(count_statement)
         return result.scalar_one() or 0
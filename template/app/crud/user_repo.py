@@ -3,16 +3,148 @@
 提供用户相关的数据库操作。
 """
 
+import asyncio
+import json
 import uuid
+import weakref
+from collections.abc import Sequence
+from datetime import datetime
 from typing import Any
 
-from sqlalchemy import Select, UnaryExpression, desc, select
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import (
+    LargeBinary,
+    Select,
+    any_,
+    bindparam,
+    delete,
+    desc,
+    func,
+    insert,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.base import CRUDBase
+from app.core.cache import BloomFilter, TTLCache, get_redis, unlink_by_pattern
+from app.core.cache_keys import CacheKeys
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.logging import logger
+from app.core.security import get_password_hash_async
+from app.crud.base import ColumnsType, CRUDBase, OrderByType
 from app.models.user import RefreshToken, User
 from app.schemas.user import UserCreate, UserUpdate
 
+# 用户查询本地缓存（L1）：缓存键 -> 用户列值快照，未命中时再查 Redis（L2）和数据库。
+# 快照包含密码哈希，只保存在进程内；Redis 中只缓存用户 ID，命中后按主键加载用户
+_user_lookup_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+    maxsize=settings.USER_LOOKUP_LOCAL_CACHE_MAXSIZE,
+    ttl=settings.USER_LOOKUP_LOCAL_CACHE_TTL,
+)
+
+# 按缓存键加锁，合并同一用户的并发回源请求；锁无人持有时自动回收
+_user_lookup_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+    weakref.WeakValueDictionary()
+)
+
+# 已注册邮箱、用户名的布隆过滤器，注册时据此跳过一定不存在的重复检查。
+# 邮箱列不区分大小写，写入和检查前统一转为小写
+_user_bloom = BloomFilter(
+    CacheKeys.USER_BLOOM,
+    capacity=settings.USER_BLOOM_CAPACITY,
+    error_rate=settings.USER_BLOOM_ERROR_RATE,
+)
+
+# 查询占用指定邮箱或用户名的用户：拆为两条唯一索引查询 UNION ALL，避免 OR 条件退化为位图扫描，只取两列
+_EMAIL_AND_USERNAME_STATEMENT = union_all(
+    select(User.email, User.username).where(User.email == bindparam("email")),
+    select(User.email, User.username).where(User.username == bindparam("username")),
+)
+
+# 用户列表的排序，OFFSET 分页和游标分页共用，与 ix_users_created_at_id_desc 索引一致；
+# 加入 ID 保证创建时间相同的用户顺序确定
+_USER_KEYSET_ORDER = (desc(User.created_at), desc(User.id))
+
+# 按 (查询列, 是否带游标) 缓存的键集分页语句，游标和条数通过绑定参数传入
+_user_keyset_statements: dict[tuple[tuple[Any, ...] | None, bool], Select[Any]] = {}
+
+# 批量查询有效的刷新令牌：整个摘要列表作为一个数组参数传入，语句文本不随令牌数量变化
+_VALID_TOKENS_STATEMENT = select(RefreshToken).where(
+    RefreshToken.token_hash == any_(bindparam("token_hashes", type_=ARRAY(LargeBinary))),
+    RefreshToken.revoked_at.is_(None),
+    RefreshToken.expires_at > func.now(),
+)
+
+
+# 按令牌摘要查询有效的刷新令牌，在 SQL 中过滤已撤回和已过期的令牌
+_VALID_TOKEN_STATEMENT = select(RefreshToken).where(
+    RefreshToken.token_hash == bindparam("token_hash"),
+    RefreshToken.revoked_at.is_(None),
+    RefreshToken.expires_at > func.now(),
+)
+
+# 撤回单个刷新令牌并取回令牌实例。UPDATE 语句中与列同名的参数名被 SET 子句保留，
+# 因此参数名加 `b_` 前缀
+_REVOKE_TOKEN_STATEMENT = (
+    update(RefreshToken)
+    .where(
+        RefreshToken.token_hash == bindparam("b_token_hash"),
+        RefreshToken.revoked_at.is_(None),
+    )
+    .values(revoked_at=func.now())
+    .returning(RefreshToken)
+    .execution_options(populate_existing=True)
+)
+
+# 撤回有效的刷新令牌并取回所属用户 ID，用于令牌轮换：验证与撤回在一条语句中原子完成
+_REVOKE_VALID_TOKEN_STATEMENT = (
+    update(RefreshToken)
+    .where(
+        RefreshToken.token_hash == bindparam("b_token_hash"),
+        RefreshToken.revoked_at.is_(None),
+        RefreshToken.expires_at > func.now(),
+    )
+    .values(revoked_at=func.now())
+    .returning(RefreshToken.user_id)
+    .execution_options(synchronize_session=False)
+)
+
+# 撤回用户的所有刷新令牌并取回令牌 ID
+_REVOKE_USER_TOKENS_STATEMENT = (
+    update(RefreshToken)
+    .where(
+        RefreshToken.user_id == bindparam("b_user_id"),
+        RefreshToken.revoked_at.is_(None),
+    )
+    .values(revoked_at=func.now())
+    .returning(RefreshToken.id)
+)
+
+# 删除过期的刷新令牌；不同步会话中的对象，避免为整批记录额外 RETURNING 主键
+_DELETE_EXPIRED_STATEMENT = (
+    delete(RefreshToken)
+    .where(RefreshToken.expires_at < func.now())
+    .execution_options(synchronize_session=False)
+)
+
+# 分批删除过期的刷新令牌，每批最多删除 `limit` 条
+_DELETE_EXPIRED_BATCH_STATEMENT = (
+    delete(RefreshToken)
+    .where(
+        RefreshToken.id.in_(
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < func.now())
+            .limit(bindparam("limit"))
+        )
+    )
+    .execution_options(synchronize_session=False)
+)
+
 
 class UserRepo(CRUDBase[User, UserCreate, UserUpdate]):
     """用户数据访问类。"""
@@ -32,7 +164,7 @@ class UserRepo(CRUDBase[User, UserCreate, UserUpdate]):
         Returns:
             用户实例，如果不存在则返回 None。
         """
-        return await self.get_by(db, email=email)
+        return await self._get_by_cached(db, CacheKeys.user_by_email(email), email=email)
 
     async def get_by_username(
         self,
@@ -49,7 +181,221 @@ class UserRepo(CRUDBase[User, UserCreate, UserUpdate]):
         Returns:
             用户实例，如果不存在则返回 None。
         """
-        return await self.get_by(db, username=username)
+        return await self._get_by_cached(
+            db, CacheKeys.user_by_username(username), username=username
+        )
+
+    async def _get_by_cached(
+        self,
+        db: AsyncSession,
+        cache_key: str,
+        **kwargs: Any,
+    ) -> User | None:
+        """依次查询本地缓存、Redis 缓存和数据库，并回填各级缓存。
+
+        同一缓存键的并发未命中只会回源一次，其余请求等待后直接读取本地缓存。
+        只缓存存在的用户，不缓存查询不到的结果，避免注册后短时间内查不到新用户。
+        Redis 中只保存用户 ID，不保存密码哈希等列；Redis 不可用时记录警告后直接查询数据库。
+
+        Args:
+            db: 数据库会话。
+            cache_key: 缓存键。
+            **kwargs: 查询条件。
+
+        Returns:
+            用户实例，如果不存在则返回 None。
+        """
+        snapshot = _user_lookup_cache.get(cache_key)
+        if snapshot is not None:
+            return await self.attach(db, data=snapshot)
+
+        lock = _user_lookup_locks.get(cache_key)
+        if lock is None:
+            lock = _user_lookup_locks[cache_key] = asyncio.Lock()
+
+        async with lock:
+            # 等待锁期间其他请求可能已回填本地缓存
+            snapshot = _user_lookup_cache.get(cache_key)
+            if snapshot is not None:
+                return await self.attach(db, data=snapshot)
+
+            redis: Redis | None = None
+            cached_id = None
+            try:
+                redis = await get_redis()
+                cached_id = await redis.get(cache_key)
+            except RedisError as e:
+                logger.warning(f"读取用户查询缓存失败，直接查询数据库: {e}")
+                redis = None
+
+            user = None
+            if cached_id is not None:
+                # 按主键加载，同一会话中已加载的用户直接从标识映射返回
+                user = await self.get(db, uuid.UUID(cached_id))
+            if user is None:
+                user = await self.get_by(db, **kwargs)
+            if user is None:
+                return None
+
+            _user_lookup_cache.set(cache_key, self.snapshot(user))
+            if redis is not None and cached_id is None:
+                try:
+                    await redis.setex(cache_key, settings.USER_LOOKUP_CACHE_TTL, str(user.id))
+                except RedisError as e:
+                    logger.warning(f"写入用户查询缓存失败: {e}")
+            return user
+
+    async def invalidate_cache(
+        self,
+        user: User,
+        *,
+        previous_email: str | None = None,
+        previous_username: str | None = None,
+    ) -> None:
+        """删除用户的邮箱、用户名查询缓存。
+
+        清理当前进程的本地缓存和 Redis 缓存，并通知其他 worker 清理各自的本地缓存，
+        同时把当前邮箱和用户名写入布隆过滤器。必须在事务提交之后调用：提交前清理时，
+        并发查询可能读到旧行并重新写回缓存，提交失败时缓存也会被白白清空。
+
+        Args:
+            user: 用户实例。
+            previous_email: 修改前的邮箱，邮箱变更时一并清理旧键。
+            previous_username: 修改前的用户名，用户名变更时一并清理旧键。
+        """
+        keys = {CacheKeys.user_by_email(user.email), CacheKeys.user_by_username(user.username)}
+        if previous_email:
+            keys.add(CacheKeys.user_by_email(previous_email))
+        if previous_username:
+            keys.add(CacheKeys.user_by_username(previous_username))
+        await self._invalidate_keys(
+            keys, [f"email:{user.email.lower()}", f"username:{user.username}"]
+        )
+
+    async def invalidate_cache_many(self, users: Sequence[tuple[str, str]]) -> None:
+        """批量删除用户的查询缓存，用于 `create_many` 的事务提交之后。
+
+        Args:
+            users: (邮箱, 用户名) 列表。
+        """
+        keys: set[str] = set()
+        items: list[str] = []
+        for email, username in users:
+            keys.add(CacheKeys.user_by_email(email))
+            keys.add(CacheKeys.user_by_username(username))
+            items.append(f"email:{email.lower()}")
+            items.append(f"username:{username}")
+        if keys:
+            await self._invalidate_keys(keys, items)
+
+    @staticmethod
+    async def _invalidate_keys(keys: set[str], bloom_items: Sequence[str]) -> None:
+        """删除指定的用户查询缓存键并通知其他 worker，再把邮箱、用户名写入布隆过滤器。
+
+        Args:
+            keys: 缓存键集合。
+            bloom_items: 写入布隆过滤器的元素。
+        """
+        for key in keys:
+            _user_lookup_cache.pop(key)
+
+        redis = await get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.unlink(*keys)
+            pipe.publish(CacheKeys.USER_INVALIDATE_CHANNEL, json.dumps(sorted(keys)))
+            await pipe.execute()
+        await _user_bloom.add(redis, *bloom_items)
+
+    @staticmethod
+    async def clear_cache() -> None:
+        """清空当前进程的本地用户查询缓存和 Redis 中的全部用户查询缓存。
+
+        不通知其他 worker，只用于测试和运维脚本，业务代码应使用 `invalidate_cache`。
+        """
+        _user_lookup_cache.clear()
+        await unlink_by_pattern(await get_redis(), f"{CacheKeys.USER_PREFIX}*")
+
+    @staticmethod
+    async def listen_cache_invalidations(redis: Redis) -> None:
+        """订阅用户缓存失效通知并清理本地缓存。
+
+        保持各 worker 的本地缓存一致，连接中断时每秒重试一次，
+        应作为后台任务在应用生命周期内运行。
+
+        Args:
+            redis: Redis 客户端。
+        """
+        while True:
+            try:
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(CacheKeys.USER_INVALIDATE_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        for key in json.loads(message["data"]):
+                            _user_lookup_cache.pop(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"用户缓存失效订阅中断，1 秒后重试: {e}")
+                await asyncio.sleep(1)
+
+    @staticmethod
+    async def may_exist(*, email: str, username: str) -> tuple[bool, bool]:
+        """通过布隆过滤器检查邮箱和用户名是否可能已被注册。
+
+        返回 False 表示一定未被注册，可跳过数据库查询；返回 True 时需要再查询数据库确认。
+
+        Args:
+            email: 邮箱。
+            username: 用户名。
+
+        Returns:
+            (邮箱是否可能存在, 用户名是否可能存在)。
+        """
+        email_may_exist, username_may_exist = await _user_bloom.might_contain(
+            await get_redis(), f"email:{email.lower()}", f"username:{username}"
+        )
+        return email_may_exist, username_may_exist
+
+    @staticmethod
+    async def ensure_bloom_filter(*, batch_size: int = 1000) -> None:
+        """确保布隆过滤器已构建，Redis 中不存在时从数据库重建。
+
+        多个 worker 同时启动时通过锁保证只有一个 worker 执行重建，
+        重建完成前过滤器视为未就绪，注册流程照常查询数据库。
+        应作为后台任务在应用启动时运行。
+
+        重建只是优化，Redis 或数据库不可用时记录警告后返回，不向调用方抛出异常。
+
+        Args:
+            batch_size: 每批读取并写入的用户数。
+        """
+        try:
+            redis = await get_redis()
+            if await _user_bloom.is_ready(redis):
+                return
+
+            lock_key = f"{CacheKeys.USER_BLOOM}:rebuild"
+            if not await redis.set(lock_key, "1", nx=True, ex=600):
+                return
+
+            try:
+                async with async_session_maker() as db:
+                    statement = select(User.email, User.username).execution_options(
+                        yield_per=batch_size
+                    )
+                    result = await db.stream(statement)
+                    async for rows in result.partitions():
+                        items = [f"email:{row.email.lower()}" for row in rows]
+                        items += [f"username:{row.username}" for row in rows]
+                        await _user_bloom.add(redis, *items)
+                await _user_bloom.mark_ready(redis)
+                logger.info("用户布隆过滤器重建完成")
+            finally:
+                await redis.unlink(lock_key)
+        except Exception as e:
+            logger.warning(f"用户布隆过滤器重建失败，注册流程将直接查询数据库: {e}")
 
     async def get_by_email_or_username(
         self,
@@ -59,6 +405,9 @@ class UserRepo(CRUDBase[User, UserCreate, UserUpdate]):
     ) -> User | None:
         """根据邮箱或用户名获取用户。
 
+        邮箱匹配优先于用户名匹配，两种查询都经过用户查询缓存，登录时通常无需查询数据库。
+        合法的邮箱都包含 `@`，不含 `@` 时只可能匹配用户名，直接按用户名查询。
+
         Args:
             db: 数据库会话。
             email_or_username: 邮箱或用户名。
@@ -66,13 +415,40 @@ class UserRepo(CRUDBase[User, UserCreate, UserUpdate]):
         Returns:
             用户实例，如果不存在则返回 None。
         """
-        from sqlalchemy import or_
+        if "@" in email_or_username:
+            user = await self.get_by_email(db, email=email_or_username)
+            if user is not None:
+                return user
+        return await self.get_by_username(db, username=email_or_username)
+
+    async def is_email_or_username_taken(
+        self,
+        db: AsyncSession,
+        *,
+        email: str,
+        username: str,
+    ) -> tuple[bool, bool]:
+        """检查邮箱和用户名是否已被占用。
 
-        statement = select(User).where(
-            or_(User.email == email_or_username, User.username == email_or_username)
+        两项检查合并为一次数据库查询。
+
+        Args:
+            db: 数据库会话。
+            email: 邮箱。
+            username: 用户名。
+
+        Returns:
+            (邮箱是否已被占用, 用户名是否已被占用)。
+        """
+        result = await db.execute(
+            _EMAIL_AND_USERNAME_STATEMENT, {"email": email, "username": username}
         )
-        result = await db.execute(statement)
-        return result.scalar_one_or_none()
+        email_taken = username_taken = False
+        for row in result:
+            # 邮箱列不区分大小写，比较时同样忽略大小写
+            email_taken = email_taken or row.email.lower() == email.lower()
+            username_taken = username_taken or row.username == username
+        return email_taken, username_taken
 
     async def create(
         self,
@@ -82,6 +458,8 @@ class UserRepo(CRUDBase[User, UserCreate, UserUpdate]):
     ) -> User:
         """创建用户。
 
+        不清理缓存，调用方提交事务后需调用 `invalidate_cache`。
+
         Args:
             db: 数据库会话。
             obj_in: 创建数据。
@@ -95,13 +473,48 @@ class UserRepo(CRUDBase[User, UserCreate, UserUpdate]):
             create_data = obj_in.model_dump()
 
         # 密码哈希处理
-        from app.core.security import get_password_hash
-
         if "password" in create_data:
-            create_data["hashed_password"] = get_password_hash(create_data.pop("password"))
+            create_data["hashed_password"] = await get_password_hash_async(
+                create_data.pop("password")
+            )
 
         return await super().create(db, obj_in=create_data)
 
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[UserCreate | dict[str, Any]],
+    ) -> int:
+        """批量创建用户。
+
+        所有密码哈希在线程池中并发计算，再通过一条 executemany INSERT 写入，
+        适用于数据填充等批量场景。不返回用户实例，也不清理缓存，
+        调用方提交事务后需调用 `invalidate_cache_many`。
+
+        Args:
+            db: 数据库会话。
+            objs_in: 创建数据列表，字典中可以包含 `is_superuser` 等额外列。
+
+        Returns:
+            创建的用户数量。
+        """
+        if not objs_in:
+            return 0
+
+        rows = [
+            dict(obj_in) if isinstance(obj_in, dict) else obj_in.model_dump()
+            for obj_in in objs_in
+        ]
+        hashed_passwords = await asyncio.gather(
+            *(get_password_hash_async(row.pop("password")) for row in rows)
+        )
+        for row, hashed_password in zip(rows, hashed_passwords, strict=True):
+            row["hashed_password"] = hashed_password
+
+        await db.execute(insert(User), rows)
+        return len(rows)
+
     async def update(
         self,
         db: AsyncSession,
@@ -111,6 +524,9 @@ class UserRepo(CRUDBase[User, UserCreate, UserUpdate]):
     ) -> User:
         """更新用户。
 
+        不清理缓存，调用方提交事务后需调用 `invalidate_cache`，
+        并传入修改前的邮箱和用户名。
+
         Args:
             db: 数据库会话。
             db_obj: 要更新的用户实例。
@@ -126,9 +542,9 @@ class UserRepo(CRUDBase[User, UserCreate, UserUpdate]):
 
         # 密码哈希处理
         if "password" in update_data and update_data["password"] is not None:
-            from app.core.security import get_password_hash
-
-            update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+            update_data["hashed_password"] = await get_password_hash_async(
+                update_data.pop("password")
+            )
 
         return await super().update(db, db_obj=db_obj, obj_in=update_data)
 
@@ -138,163 +554,327 @@ class UserRepo(CRUDBase[User, UserCreate, UserUpdate]):
         *,
         skip: int = 0,
         limit: int = 100,
-        order_by: UnaryExpression[Any] | None = None,
-    ) -> list[User]:
+        order_by: OrderByType | None = None,
+        columns: ColumnsType | None = None,
+    ) -> list[Any]:
         """获取用户列表。
 
         Args:
             db: 数据库会话。
             skip: 跳过的记录数。
             limit: 返回的最大记录数。
-            order_by: 排序条件。
+            order_by: 排序条件，默认与游标分页一致，按 (创建时间, ID) 倒序。
+            columns: 只查询的列。
+
+        Returns:
+            用户实例列表，指定 `columns` 时为行列表。
+        """
+        if order_by is None:
+            order_by = _USER_KEYSET_ORDER
+        return list(
+            await super().get_multi(
+                db, skip=skip, limit=limit, order_by=order_by, columns=columns
+            )
+        )
+
+    async def get_multi_with_total(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        order_by: OrderByType | None = None,
+        columns: ColumnsType | None = None,
+    ) -> tuple[list[Any], int]:
+        """获取用户列表及用户总数。
+
+        Args:
+            db: 数据库会话。
+            skip: 跳过的记录数。
+            limit: 返回的最大记录数。
+            order_by: 排序条件，默认与游标分页一致，按 (创建时间, ID) 倒序。
+            columns: 只查询的列。
+
+        Returns:
+            (用户实例列表, 用户总数) 元组，指定 `columns` 时为行列表。
+        """
+        if order_by is None:
+            order_by = _USER_KEYSET_ORDER
+        return await super().get_multi_with_total(
+            db, skip=skip, limit=limit, order_by=order_by, columns=columns
+        )
+
+    async def get_multi_plus_one(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        order_by: OrderByType | None = None,
+        columns: ColumnsType | None = None,
+    ) -> tuple[list[Any], bool]:
+        """获取用户列表及是否还有更多用户。
+
+        Args:
+            db: 数据库会话。
+            skip: 跳过的记录数。
+            limit: 返回的最大记录数。
+            order_by: 排序条件，默认与游标分页一致，按 (创建时间, ID) 倒序。
+            columns: 只查询的列。
 
         Returns:
-            用户实例列表。
+            (用户实例列表, 是否还有更多用户) 元组，指定 `columns` 时为行列表。
         """
         if order_by is None:
-            order_by = desc(User.created_at)
-        return list(await super().get_multi(db, skip=skip, limit=limit, order_by=order_by))
+            order_by = _USER_KEYSET_ORDER
+        return await super().get_multi_plus_one(
+            db, skip=skip, limit=limit, order_by=order_by, columns=columns
+        )
+
+    async def get_multi_after(
+        self,
+        db: AsyncSession,
+        *,
+        after: tuple[datetime, uuid.UUID] | None = None,
+        limit: int = 100,
+        columns: ColumnsType | None = None,
+    ) -> tuple[list[Any], bool]:
+        """按游标获取用户列表及是否还有更多用户。
+
+        按 (创建时间, ID) 倒序做键集分页，通过 `WHERE (created_at, id) < (:c, :id)`
+        直接定位到游标之后的位置，查询代价与页码深度无关。
+
+        Args:
+            db: 数据库会话。
+            after: 上一页最后一个用户的 (创建时间, ID)，为 None 时从第一页开始。
+            limit: 返回的最大记录数。
+            columns: 只查询的列。
+
+        Returns:
+            (用户实例列表, 是否还有更多用户) 元组，指定 `columns` 时为行列表。
+        """
+        params: dict[str, Any] = {"limit": limit + 1}
+        if after is not None:
+            params["after_created_at"], params["after_id"] = after
+        statement = self._get_multi_after_statement(columns, after is not None)
+        result = await db.execute(statement, params)
+        items = list(result.all() if columns else result.scalars().all())
+        return items[:limit], len(items) > limit
+
+    def _get_multi_after_statement(
+        self, columns: ColumnsType | None, with_after: bool
+    ) -> Select[Any]:
+        """获取键集分页查询语句。
+
+        每种查询列和游标组合只构建一次语句，之后直接复用，
+        省去每次翻页重新构建查询和生成编译缓存键的开销。
+
+        Args:
+            columns: 只查询的列。
+            with_after: 是否带游标条件。
+
+        Returns:
+            以 `limit`、`after_created_at`、`after_id` 作为绑定参数的查询语句。
+        """
+        key = (tuple(columns) if columns else None, with_after)
+        statement = _user_keyset_statements.get(key)
+        if statement is None:
+            statement = self._select(columns)
+            if with_after:
+                statement = statement.where(
+                    tuple_(User.created_at, User.id)
+                    < tuple_(
+                        bindparam("after_created_at", type_=User.created_at.type),
+                        bindparam("after_id", type_=User.id.type),
+                    )
+                )
+            statement = statement.order_by(*_USER_KEYSET_ORDER).limit(bindparam("limit"))
+            _user_keyset_statements[key] = statement
+        return statement
 
 
 class RefreshTokenRepo(CRUDBase[RefreshToken, dict[str, Any], dict[str, Any]]):
     """刷新令牌数据访问类。"""
 
-    async def get_by_token(
+    async def get_by_token_hash(
         self,
         db: AsyncSession,
         *,
-        token: str,
+        token_hash: bytes,
     ) -> RefreshToken | None:
-        """根据令牌字符串获取刷新令牌。
+        """根据令牌摘要获取刷新令牌。
 
         Args:
             db: 数据库会话。
-            token: 令牌字符串。
+            token_hash: 令牌摘要，由 `hash_token` 计算。
 
         Returns:
             刷新令牌实例，如果不存在则返回 None。
         """
-        return await self.get_by(db, token=token)
+        return await self.get_by(db, token_hash=token_hash)
 
     async def get_valid_by_token(
         self,
         db: AsyncSession,
         *,
-        token: str,
+        token_hash: bytes,
     ) -> RefreshToken | None:
-        """根据令牌字符串获取有效的刷新令牌。
+        """根据令牌摘要获取有效的刷新令牌。
 
         Args:
             db: 数据库会话。
-            token: 令牌字符串。
+            token_hash: 令牌摘要，由 `hash_token` 计算。
 
         Returns:
             有效的刷新令牌实例，如果不存在或无效则返回 None。
         """
-        refresh_token = await self.get_by_token(db, token=token)
-        if refresh_token and refresh_token.is_valid:
-            return refresh_token
-        return None
+        result = await db.execute(_VALID_TOKEN_STATEMENT, {"token_hash": token_hash})
+        return result.scalar_one_or_none()
+
+    async def get_valid_by_tokens(
+        self,
+        db: AsyncSession,
+        *,
+        token_hashes: Sequence[bytes],
+    ) -> dict[bytes, RefreshToken]:
+        """批量获取有效的刷新令牌。
+
+        所有令牌通过一条 `token_hash = ANY(:token_hashes)` 查询获取，只产生一次数据库往返。
+
+        Args:
+            db: 数据库会话。
+            token_hashes: 令牌摘要列表。
+
+        Returns:
+            令牌摘要到刷新令牌实例的映射，无效的令牌不包含在内。
+        """
+        if not token_hashes:
+            return {}
+        result = await db.execute(
+            _VALID_TOKENS_STATEMENT, {"token_hashes": list(token_hashes)}
+        )
+        return {
+            refresh_token.token_hash: refresh_token for refresh_token in result.scalars()
+        }
 
     async def create(
         self,
         db: AsyncSession,
         *,
         user_id: uuid.UUID,
-        token: str,
+        token_hash: bytes,
         expires_at: Any,
+        flush: bool = True,
     ) -> RefreshToken:
         """创建刷新令牌。
 
         Args:
             db: 数据库会话。
             user_id: 用户 ID。
-            token: 令牌字符串。
+            token_hash: 令牌摘要，由 `hash_token` 计算。
             expires_at: 过期时间。
+            flush: 是否立即刷新到数据库。随后马上提交的调用方可传入 False，
+                INSERT 由提交时的自动刷新发出，省去一次单独的刷新。
 
         Returns:
             创建的刷新令牌实例。
         """
-        return await super().create(
-            db,
-            obj_in={
-                "user_id": user_id,
-                "token": token,
-                "expires_at": expires_at,
-            },
+        # 所有列都在客户端生成，插入后无需再 SELECT 刷新实例
+        refresh_token = RefreshToken(
+            user_id=user_id, token_hash=token_hash, expires_at=expires_at
         )
+        db.add(refresh_token)
+        if flush:
+            await db.flush()
+        return refresh_token
 
     async def revoke(
         self,
         db: AsyncSession,
         *,
-        token: str,
+        token_hash: bytes,
     ) -> RefreshToken | None:
         """撤回刷新令牌。
 
+        使用单条 `UPDATE ... RETURNING` 语句撤回并取回令牌，只产生一次数据库往返。
+
         Args:
             db: 数据库会话。
-            token: 令牌字符串。
+            token_hash: 令牌摘要，由 `hash_token` 计算。
 
         Returns:
-            被撤回的刷新令牌实例，如果不存在则返回 None。
+            被撤回的刷新令牌实例，如果不存在或已被撤回则返回 None。
         """
-        refresh_token = await self.get_by_token(db, token=token)
-        if refresh_token:
-            refresh_token.revoke()
-            await db.flush()
-            await db.refresh(refresh_token)
-        return refresh_token
+        result = await db.execute(_REVOKE_TOKEN_STATEMENT, {"b_token_hash": token_hash})
+        return result.scalar_one_or_none()
+
+    async def revoke_and_fetch(
+        self,
+        db: AsyncSession,
+        *,
+        token_hash: bytes,
+    ) -> uuid.UUID | None:
+        """撤回有效的刷新令牌并返回其所属用户 ID。
+
+        验证（未撤回、未过期）和撤回在一条 `UPDATE ... RETURNING` 语句中原子完成，
+        同一令牌并发刷新时只有一个请求能成功。
+
+        Args:
+            db: 数据库会话。
+            token_hash: 令牌摘要，由 `hash_token` 计算。
+
+        Returns:
+            令牌所属用户 ID，如果令牌不存在或无效则返回 None。
+        """
+        result = await db.execute(
+            _REVOKE_VALID_TOKEN_STATEMENT, {"b_token_hash": token_hash}
+        )
+        return result.scalar_one_or_none()
 
     async def revoke_user_tokens(
         self,
         db: AsyncSession,
         *,
         user_id: uuid.UUID,
-    ) -> list[RefreshToken]:
+    ) -> list[uuid.UUID]:
         """撤回用户的所有刷新令牌。
 
+        使用单条 UPDATE 语句批量撤回，无需逐个加载令牌实例。
+
         Args:
             db: 数据库会话。
             user_id: 用户 ID。
 
         Returns:
-            被撤回的刷新令牌实例列表。
+            被撤回的刷新令牌 ID 列表。
         """
-        from sqlalchemy import select
-
-        statement = select(RefreshToken).where(
-            RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None)
+        result = await db.execute(
+            _REVOKE_USER_TOKENS_STATEMENT, {"b_user_id": user_id}
         )
-        result = await db.execute(statement)
-        tokens = list(result.scalars().all())
-
-        for token in tokens:
-            token.revoke()
-
-        await db.flush()
-        return tokens
+        return list(result.scalars().all())
 
     async def delete_expired(
         self,
         db: AsyncSession,
+        *,
+        limit: int | None = None,
     ) -> int:
         """删除过期的刷新令牌。
 
+        指定 `limit` 时每次最多删除 `limit` 条，由调用方循环调用并逐批提交，
+        避免单个大事务长时间持有行锁并产生大量 WAL。
+
         Args:
             db: 数据库会话。
+            limit: 本次最多删除的记录数，None 表示不限制。
 
         Returns:
             删除的记录数。
         """
-        from datetime import datetime, timezone
-        from sqlalchemy import delete
-
-        statement = delete(RefreshToken).where(
-            RefreshToken.expires_at < datetime.now(timezone.utc)
-        )
-        result = await db.execute(statement)
-        await db.flush()
+        if limit is None:
+            result = await db.execute(_DELETE_EXPIRED_STATEMENT)
+        else:
+            result = await db.execute(_DELETE_EXPIRED_BATCH_STATEMENT, {"limit": limit})
         return result.rowcount
 
 
@@ -3,6 +3,7 @@
 创建和配置 FastAPI 应用实例。
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Any
 
@@ -12,10 +13,12 @@ from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 
 from app.api.v1.router import api_router
-from app.core.cache import close_redis
+from app.core.cache import close_redis, get_redis
 from app.core.config import settings
 from app.core.database import close_db
 from app.core.logging import logger
+from app.core.responses import FastJSONResponse
+from app.crud.user_repo import user_repo
 from app.middleware.error_handler import (
     app_exception_handler,
     general_exception_handler,
@@ -23,6 +26,7 @@ from app.middleware.error_handler import (
 )
 from app.middleware.logging import LoggingMiddleware
 from app.exceptions import AppException
+from app.services.auth_service import AuthService
 
 
 @asynccontextmanager
@@ -41,6 +45,19 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # 注意：数据库迁移请使用 Alembic
     # alembic upgrade head
 
+    # 订阅令牌撤回和用户快照失效通知，保持各 worker 的本地认证缓存一致
+    revocation_listener = asyncio.create_task(
+        AuthService.listen_cache_invalidations(await get_redis())
+    )
+
+    # 订阅用户缓存失效通知，保持各 worker 的本地用户缓存一致
+    user_cache_listener = asyncio.create_task(
+        user_repo.listen_cache_invalidations(await get_redis())
+    )
+
+    # 检查用户布隆过滤器，Redis 中不存在时在后台从数据库重建
+    bloom_builder = asyncio.create_task(user_repo.ensure_bloom_filter())
+
     logger.info("应用程序启动完成")
 
     yield
@@ -48,16 +65,27 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # 关闭时执行
     logger.info("应用程序关闭中...")
 
-    # 关闭 Redis 连接
-    await close_redis()
-    logger.info("Redis 连接已关闭")
-
-    # 关闭数据库连接
-    await close_db()
-    logger.info("数据库连接已关闭")
+    # 停止缓存同步订阅和布隆过滤器重建
+    for listener in (revocation_listener, user_cache_listener, bloom_builder):
+        listener.cancel()
+        try:
+            await listener
+        except asyncio.CancelledError:
+            pass
+
+    # 并发关闭 Redis 和数据库连接，其中一个失败不影响另一个释放
+    results = await asyncio.gather(close_redis(), close_db(), return_exceptions=True)
+    for name, result in zip(("Redis", "数据库"), results, strict=True):
+        if isinstance(result, BaseException):
+            logger.opt(exception=result).error(f"{name} 连接关闭失败: {result}")
+        else:
+            logger.info(f"{name} 连接已关闭")
 
     logger.info("应用程序已关闭")
 
+    # 等待后台日志队列写完
+    await logger.complete()
+
 
 # 创建 FastAPI 应用实例
 app = FastAPI(
@@ -67,6 +95,7 @@ app = FastAPI(
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
     openapi_url="/openapi.json" if settings.DEBUG else None,
+    default_response_class=FastJSONResponse,
     lifespan=lifespan,
 )
 
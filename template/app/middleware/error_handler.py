@@ -3,11 +3,14 @@
 统一处理应用程序中的异常，返回标准化的错误响应。
 """
 
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from functools import lru_cache
+
+from fastapi import Request, Response, status
 from pydantic import ValidationError
+from pydantic_core import to_json
 
-from app.core.logging import logger
+from app.core.logging import logger, request_id_var
+from app.core.responses import FastJSONResponse
 from app.exceptions import (
     AppException,
     AuthenticationException,
@@ -20,10 +23,27 @@ from app.exceptions import (
 )
 
 
+@lru_cache(maxsize=256)
+def _error_body(code: int, message: str) -> bytes:
+    """构建不含详细信息的错误响应体。
+
+    认证失败、权限不足等常见错误的响应体只由状态码和消息决定，
+    缓存序列化结果，避免每次出错都重新构建字典并编码 JSON。
+
+    Args:
+        code: 错误码。
+        message: 错误消息。
+
+    Returns:
+        JSON 字节串。
+    """
+    return to_json({"code": code, "message": message, "detail": None})
+
+
 async def app_exception_handler(
     request: Request,
     exc: AppException,
-) -> JSONResponse:
+) -> Response:
     """处理应用程序自定义异常。
 
     Args:
@@ -33,13 +53,20 @@ async def app_exception_handler(
     Returns:
         JSON 错误响应。
     """
-    request_id = getattr(request.state, "request_id", "unknown")
+    request_id = request_id_var.get()
 
     logger.bind(request_id=request_id, exception_type=type(exc).__name__, code=exc.code).error(
         f"业务异常: {exc.message}"
     )
 
-    return JSONResponse(
+    if exc.detail is None:
+        return Response(
+            content=_error_body(exc.code, exc.message),
+            status_code=exc.code,
+            media_type="application/json",
+        )
+
+    return FastJSONResponse(
         status_code=exc.code,
         content={
             "code": exc.code,
@@ -52,7 +79,7 @@ async def app_exception_handler(
 async def validation_exception_handler(
     request: Request,
     exc: ValidationError,
-) -> JSONResponse:
+) -> FastJSONResponse:
     """处理 Pydantic 验证异常。
 
     Args:
@@ -62,13 +89,13 @@ async def validation_exception_handler(
     Returns:
         JSON 错误响应。
     """
-    request_id = getattr(request.state, "request_id", "unknown")
+    request_id = request_id_var.get()
 
     logger.bind(request_id=request_id, exception_type="ValidationError").warning(
         "验证异常"
     )
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "code": status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -81,7 +108,7 @@ async def validation_exception_handler(
 async def general_exception_handler(
     request: Request,
     exc: Exception,
-) -> JSONResponse:
+) -> FastJSONResponse:
     """处理通用异常。
 
     Args:
@@ -91,14 +118,14 @@ async def general_exception_handler(
     Returns:
         JSON 错误响应。
     """
-    request_id = getattr(request.state, "request_id", "unknown")
+    request_id = request_id_var.get()
 
-    logger.bind(request_id=request_id, exception_type=type(exc).__name__).error(
-        f"未处理的异常: {str(exc)}",
-        exc_info=True,
-    )
+    # loguru 不识别 exc_info 参数，需要通过 opt(exception=...) 附带异常堆栈
+    logger.opt(exception=exc).bind(
+        request_id=request_id, exception_type=type(exc).__name__
+    ).error(f"未处理的异常: {str(exc)}")
 
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "code": status.HTTP_500_INTERNAL_SERVER_ERROR,
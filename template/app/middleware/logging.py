@@ -4,78 +4,110 @@
 """
 
 import time
-from typing import Callable
+from uuid import uuid4
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.logging import logger
+from app.core.config import settings
+from app.core.logging import logger, request_id_var
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """日志中间件。
 
-    记录每个请求的处理时间和响应状态。
+    记录每个请求的处理时间和响应状态，超过 `SLOW_REQUEST_MS` 的请求记录为警告。
+    实现为纯 ASGI 中间件，不经过 `BaseHTTPMiddleware` 的任务组和响应流转发。
     """
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable,
-    ) -> Response:
-        """处理请求。
+    def __init__(self, app: ASGIApp) -> None:
+        """初始化中间件。
 
         Args:
-            request: HTTP 请求对象。
-            call_next: 下一个中间件或路由处理器。
+            app: ASGI 应用实例。
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """处理请求。
 
-        Returns:
-            HTTP 响应对象。
+        Args:
+            scope: ASGI scope。
+            receive: ASGI receive callable。
+            send: ASGI send callable。
         """
-        # 获取请求 ID
-        request_id = getattr(request.state, "request_id", "unknown")
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # 获取请求 ID：优先沿用上游传入的 ID，否则生成新的 ID
+        request_id = scope.get("request_id")
+        if not request_id:
+            for key, value in scope.get("headers", ()):
+                if key == b"x-request-id":
+                    request_id = value.decode("latin-1")
+                    break
+            else:
+                request_id = str(uuid4())
+        scope["request_id"] = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+        request_id_var.set(request_id)
+
+        method = scope["method"]
+        path = scope["path"]
 
         # 记录请求开始
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
 
-        # 记录请求信息
-        logger.info(
-            f"请求开始: {request.method} {request.url.path}",
-            extra={"request_id": request_id},
-        )
+        # 记录请求信息，使用参数化格式，日志级别被过滤时不会格式化消息
+        logger.debug("请求开始: {} {}", method, path)
 
-        # 处理请求
-        try:
-            response = await call_next(request)
+        status_code = 500
 
-            # 计算处理时间
-            process_time = time.time() - start_time
-
-            # 添加自定义响应头
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Process-Time"] = str(process_time)
-
-            # 记录响应信息
-            logger.info(
-                f"请求完成: {request.method} {request.url.path} - "
-                f"状态码: {response.status_code} - "
-                f"处理时间: {process_time:.3f}s",
-                extra={"request_id": request_id},
-            )
-
-            return response
+        async def send_wrapper(message: Message) -> None:
+            """在响应头发出前记录状态码并添加自定义响应头。"""
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = (time.perf_counter_ns() - start_time) / 1e9
+                headers = list(message.get("headers", ()))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                headers.append((b"x-process-time", b"%.3f" % process_time))
+                message["headers"] = headers
+            await send(message)
 
+        # 处理请求
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             # 计算处理时间
-            process_time = time.time() - start_time
+            process_time = (time.perf_counter_ns() - start_time) / 1e9
 
             # 记录错误
-            logger.error(
-                f"请求失败: {request.method} {request.url.path} - "
+            logger.opt(exception=True).error(
+                f"请求失败: {method} {path} - "
                 f"错误: {str(e)} - "
-                f"处理时间: {process_time:.3f}s",
-                extra={"request_id": request_id},
-                exc_info=True,
+                f"处理时间: {process_time:.3f}s"
             )
 
             raise
+
+        # 计算处理时间
+        process_time = (time.perf_counter_ns() - start_time) / 1e9
+
+        # 记录响应信息，只有慢请求以 WARNING 级别记录，其余请求只在 DEBUG 级别记录
+        if process_time * 1000 > settings.SLOW_REQUEST_MS:
+            logger.warning(
+                "慢请求: {} {} - 状态码: {} - 处理时间: {:.3f}s",
+                method,
+                path,
+                status_code,
+                process_time,
+            )
+        else:
+            logger.debug(
+                "请求完成: {} {} - 状态码: {} - 处理时间: {:.3f}s",
+                method,
+                path,
+                status_code,
+                process_time,
+            )
@@ -3,13 +3,35 @@
 定义所有模型的基类和 Mixin。
 """
 
+import os
+import re
+import time
 import uuid
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, ClassVar
 
-from sqlalchemy import DateTime, func
+from sqlalchemy import DateTime, event, func
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
+from sqlalchemy.orm import DeclarativeBase, Mapped, Mapper, declared_attr, mapped_column
+
+# 驼峰命名中除首字母外的大写字母，用于转换为蛇形命名
+_CAMEL_BOUNDARY = re.compile(r"(?<!^)([A-Z])")
+
+
+def _uuid7() -> uuid.UUID:
+    """生成 UUIDv7（RFC 9562）。
+
+    高 48 位为毫秒级 Unix 时间戳，其余为随机位。按时间递增的主键使新记录
+    追加在 B-tree 索引末尾，避免随机 UUID 造成的页分裂和缓存失效。
+
+    Returns:
+        UUIDv7 实例。
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    # 设置版本号 7 和 RFC 4122 变体位
+    value = value & ~(0xF << 76) | (0x7 << 76)
+    value = value & ~(0x3 << 62) | (0x2 << 62)
+    return uuid.UUID(int=value)
 
 
 class Base(DeclarativeBase):
@@ -18,6 +40,9 @@ class Base(DeclarativeBase):
     所有 SQLAlchemy 模型的基类，提供通用功能。
     """
 
+    # 列属性名，映射配置完成时计算一次，供 __repr__ 使用
+    _repr_cols: ClassVar[tuple[str, ...]] = ()
+
     @declared_attr.directive
     def __tablename__(cls) -> str:
         """自动生成表名。
@@ -27,17 +52,8 @@ class Base(DeclarativeBase):
         Returns:
             表名字符串。
         """
-        name = cls.__name__
-        # 转换为蛇形命名
-        result = [name[0].lower()]
-        for char in name[1:]:
-            if char.isupper():
-                result.extend(["_", char.lower()])
-            else:
-                result.append(char)
-        table_name = "".join(result)
-        # 添加复数 s
-        return f"{table_name}s"
+        # 转换为蛇形命名并添加复数 s
+        return _CAMEL_BOUNDARY.sub(r"_\1", cls.__name__).lower() + "s"
 
     def __repr__(self) -> str:
         """返回模型的字符串表示。
@@ -45,27 +61,36 @@ class Base(DeclarativeBase):
         Returns:
             模型的字符串表示。
         """
-        class_name = self.__class__.__name__
-        attrs = []
-        for key in self.__mapper__.columns.keys():
-            value = getattr(self, key, None)
-            if key == "hashed_password":
-                value = "***"
-            attrs.append(f"{key}={value!r}")
-        return f"{class_name}({', '.join(attrs)})"
+        attrs = ", ".join(
+            f"{key}='***'"
+            if key == "hashed_password"
+            else f"{key}={getattr(self, key, None)!r}"
+            for key in self._repr_cols
+        )
+        return f"{self.__class__.__name__}({attrs})"
+
+
+@event.listens_for(Base, "mapper_configured", propagate=True)
+def _cache_repr_columns(mapper: Mapper[Any], cls: type[Base]) -> None:
+    """映射配置完成后缓存模型的列属性名。
+
+    Args:
+        mapper: 模型的映射器。
+        cls: 模型类。
+    """
+    cls._repr_cols = tuple(mapper.columns.keys())
 
 
 class UUIDMixin:
     """UUID 主键 Mixin。
 
-    为模型提供 UUID 主键。
+    为模型提供 UUID 主键，新记录使用按时间递增的 UUIDv7。
     """
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
-        index=True,
+        default=_uuid7,
     )
 
 
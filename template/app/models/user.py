@@ -7,8 +7,8 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import Boolean, DateTime, String, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, DateTime, Index, LargeBinary, String, func
+from sqlalchemy.dialects.postgresql import CITEXT, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, SoftDeleteMixin, TimestampMixin, UUIDMixin
@@ -20,9 +20,9 @@ class User(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     存储用户认证和基本信息。
     """
 
-    # 用户认证信息
+    # 用户认证信息，邮箱使用 CITEXT 类型，不区分大小写比较且可以使用唯一索引
     email: Mapped[str] = mapped_column(
-        String(255),
+        CITEXT(),
         unique=True,
         index=True,
         nullable=False,
@@ -63,14 +63,18 @@ class User(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     )
 
 
+# 用户列表按 (创建时间, ID) 倒序分页，为排序和游标分页建立索引，避免每次列表查询都做全表排序
+Index("ix_users_created_at_id_desc", User.created_at.desc(), User.id.desc())
+
+
 class RefreshToken(Base, UUIDMixin):
     """刷新令牌模型。
 
-    管理 JWT 刷新令牌的存储和撤回。
+    管理 JWT 刷新令牌的存储和撤回，只保存令牌的 SHA-256 摘要。
     """
 
-    token: Mapped[str] = mapped_column(
-        String(255),
+    token_hash: Mapped[bytes] = mapped_column(
+        LargeBinary(32),
         unique=True,
         index=True,
         nullable=False,
@@ -1,7 +1,7 @@
 """Pydantic Schema 模块。"""
 
 from app.schemas.base import MetaResponse, PageResponse
-from app.schemas.token import TokenPayload, TokenResponse
+from app.schemas.token import TokenClaims, TokenPayload, TokenResponse
 from app.schemas.user import (
     UserCreate,
     UserLogin,
@@ -12,6 +12,7 @@ from app.schemas.user import (
 __all__ = [
     "MetaResponse",
     "PageResponse",
+    "TokenClaims",
     "TokenPayload",
     "TokenResponse",
     "UserCreate",
@@ -5,6 +5,7 @@
 
 from typing import Any, Generic, TypeVar
 
+from fastapi import Response
 from pydantic import BaseModel, Field
 
 DataType = TypeVar("DataType")
@@ -14,20 +15,22 @@ class MetaResponse(BaseModel):
     """分页元数据响应。
 
     Attributes:
-        total: 总记录数。
-        page: 当前页码。
+        total: 总记录数，未统计时为 None。
+        page: 当前页码，游标分页时为 None。
         size: 每页数量。
-        pages: 总页数。
+        pages: 总页数，未统计总数时为 None。
         has_next: 是否有下一页。
         has_prev: 是否有上一页。
+        next_cursor: 下一页游标，没有下一页或未使用游标分页时为 None。
     """
 
-    total: int = Field(..., description="总记录数", ge=0)
-    page: int = Field(..., description="当前页码", ge=1)
+    total: int | None = Field(default=None, description="总记录数", ge=0)
+    page: int | None = Field(default=None, description="当前页码", ge=1)
     size: int = Field(..., description="每页数量", ge=1)
-    pages: int = Field(..., description="总页数", ge=0)
+    pages: int | None = Field(default=None, description="总页数", ge=0)
     has_next: bool = Field(..., description="是否有下一页")
     has_prev: bool = Field(..., description="是否有上一页")
+    next_cursor: str | None = Field(default=None, description="下一页游标")
 
 
 class PageResponse(BaseModel, Generic[DataType]):
@@ -45,24 +48,34 @@ class PageResponse(BaseModel, Generic[DataType]):
     def create(
         cls,
         items: list[DataType],
-        total: int,
-        page: int,
+        total: int | None,
+        page: int | None,
         size: int,
+        has_next: bool | None = None,
+        has_prev: bool | None = None,
+        next_cursor: str | None = None,
     ) -> "PageResponse[DataType]":
         """创建分页响应。
 
         Args:
             items: 数据列表。
-            total: 总记录数。
-            page: 当前页码。
+            total: 总记录数，为 None 时不计算总页数。
+            page: 当前页码，游标分页时为 None。
             size: 每页数量。
+            has_next: 是否有下一页，为 None 时根据总数计算。
+            has_prev: 是否有上一页，为 None 时根据页码计算。
+            next_cursor: 下一页游标。
 
         Returns:
             分页响应对象。
         """
-        pages = (total + size - 1) // size if size > 0 else 0
-        has_next = page < pages
-        has_prev = page > 1
+        pages = None
+        if total is not None:
+            pages = (total + size - 1) // size if size > 0 else 0
+            if has_next is None and page is not None:
+                has_next = page < pages
+        if has_prev is None:
+            has_prev = page is not None and page > 1
 
         return cls(
             items=items,
@@ -71,8 +84,9 @@ class PageResponse(BaseModel, Generic[DataType]):
                 page=page,
                 size=size,
                 pages=pages,
-                has_next=has_next,
+                has_next=bool(has_next),
                 has_prev=has_prev,
+                next_cursor=next_cursor,
             ),
         )
 
@@ -127,3 +141,21 @@ class ApiResponse(BaseModel, Generic[DataType]):
             API 响应对象。
         """
         return cls(code=code, message=message, detail=detail)
+
+    def to_response(self, status_code: int = 200) -> Response:
+        """序列化为 JSON 响应。
+
+        由 pydantic-core 直接序列化为字节，端点返回该响应时 FastAPI 不再执行
+        响应模型校验和 jsonable_encoder 转换，适用于数据已可信的大响应体。
+
+        Args:
+            status_code: HTTP 状态码。
+
+        Returns:
+            JSON 响应对象。
+        """
+        return Response(
+            content=self.model_dump_json(),
+            status_code=status_code,
+            media_type="application/json",
+        )
@@ -3,7 +3,9 @@
 定义 JWT 令牌相关的 Schema。
 """
 
-from pydantic import BaseModel, Field
+import uuid
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class TokenPayload(BaseModel):
@@ -20,6 +22,25 @@ class TokenPayload(BaseModel):
     type: str = Field(..., description="令牌类型")
 
 
+class TokenClaims(BaseModel):
+    """访问令牌中的用户声明。
+
+    签发访问令牌时写入令牌，在令牌有效期内直接信任，只做权限检查的端点无需查询数据库。
+    账户状态和权限的变更要等到令牌过期后才生效，延迟不超过访问令牌的有效期。
+
+    Attributes:
+        id: 用户 ID。
+        is_active: 账户是否启用。
+        is_superuser: 是否为超级管理员。
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    id: uuid.UUID = Field(..., description="用户 ID")
+    is_active: bool = Field(..., description="账户是否启用")
+    is_superuser: bool = Field(..., description="是否为超级管理员")
+
+
 class TokenResponse(BaseModel):
     """令牌响应 Schema。
 
@@ -29,6 +50,9 @@ class TokenResponse(BaseModel):
         token_type: 令牌类型。
     """
 
+    # 纯输出模型，创建后不再修改
+    model_config = ConfigDict(frozen=True)
+
     access_token: str = Field(..., description="访问令牌")
     refresh_token: str = Field(..., description="刷新令牌")
     token_type: str = Field(default="bearer", description="令牌类型")
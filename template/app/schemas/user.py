@@ -3,10 +3,12 @@
 定义用户相关的请求和响应 Schema。
 """
 
+import operator
 import uuid
 from datetime import datetime
+from typing import Any
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class UserBase(BaseModel):
@@ -20,12 +22,16 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     """用户创建 Schema。"""
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     password: str = Field(..., min_length=8, max_length=100, description="密码")
 
 
 class UserUpdate(BaseModel):
     """用户更新 Schema。"""
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     email: EmailStr | None = Field(None, description="用户邮箱")
     full_name: str | None = Field(None, max_length=100, description="用户显示名称")
     password: str | None = Field(None, min_length=8, max_length=100, description="密码")
@@ -34,6 +40,8 @@ class UserUpdate(BaseModel):
 class UserLogin(BaseModel):
     """用户登录 Schema。"""
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     username: str = Field(..., description="用户名或邮箱")
     password: str = Field(..., description="密码")
 
@@ -41,6 +49,8 @@ class UserLogin(BaseModel):
 class UserResponse(BaseModel):
     """用户响应 Schema。"""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: uuid.UUID = Field(..., description="用户 ID")
     email: str = Field(..., description="用户邮箱")
     username: str = Field(..., description="用户名")
@@ -51,7 +61,23 @@ class UserResponse(BaseModel):
     created_at: datetime = Field(..., description="创建时间")
     updated_at: datetime = Field(..., description="更新时间")
 
-    class Config:
-        """Pydantic 配置。"""
+    @classmethod
+    def from_orm_fast(cls, user: Any) -> "UserResponse":
+        """从可信的 ORM 实例快速构建响应。
+
+        数据来自数据库，无需再次校验，直接按字段取值构建以跳过 Pydantic 的逐字段校验。
+
+        Args:
+            user: 用户 ORM 实例，或包含响应所需各列的查询行。
+
+        Returns:
+            用户响应对象。
+        """
+        return cls.model_construct(
+            **dict(zip(_USER_RESPONSE_FIELDS, _get_user_response_values(user), strict=True))
+        )
+
 
-        from_attributes = True
+# UserResponse 字段名及批量取值函数，在模块加载时计算一次
+_USER_RESPONSE_FIELDS = tuple(UserResponse.model_fields)
+_get_user_response_values = operator.attrgetter(*_USER_RESPONSE_FIELDS)
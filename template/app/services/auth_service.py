@@ -3,18 +3,28 @@
 提供用户认证和令牌管理功能。
 """
 
+import asyncio
+import hashlib
+import hmac
+import time
+import uuid
 from datetime import datetime, timezone, timedelta
 from typing import Any
 
 from redis.asyncio import Redis
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.logging import logger
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    verify_password,
+    hash_token,
+    verify_and_update_password_async,
 )
 from app.crud.user_repo import refresh_token_repo, user_repo
 from app.exceptions import (
@@ -23,12 +33,142 @@ from app.exceptions import (
     ResourceNotFoundException,
 )
 from app.models.user import RefreshToken, User
-from app.schemas.token import TokenResponse
+from app.schemas.token import TokenClaims, TokenResponse
 from app.schemas.user import UserCreate, UserLogin
 
 
 # Token 黑名单键前缀
 ACCESS_TOKEN_BLACKLIST_PREFIX = "access_token_blacklist:"
+_BLACKLIST_PREFIX_B = ACCESS_TOKEN_BLACKLIST_PREFIX.encode()
+
+# 令牌撤回通知的 Redis 发布/订阅频道
+ACCESS_TOKEN_REVOKED_CHANNEL = "access_token_revoked"
+
+# 用户快照失效通知的 Redis 发布/订阅频道，消息内容为用户 ID
+USER_SNAPSHOT_INVALIDATED_CHANNEL = "user_snapshot_invalidated"
+
+# 令牌黑名单本地缓存：令牌摘要 -> 是否已撤回
+_blacklist_cache: TTLCache[bytes, bool] = TTLCache(
+    maxsize=settings.TOKEN_BLACKLIST_CACHE_MAXSIZE,
+    ttl=settings.TOKEN_BLACKLIST_CACHE_TTL,
+)
+
+# 当前用户本地缓存：令牌摘要 -> 用户 ID
+_token_user_cache: TTLCache[bytes, str] = TTLCache(
+    maxsize=settings.CURRENT_USER_CACHE_MAXSIZE,
+    ttl=settings.CURRENT_USER_CACHE_TTL,
+)
+
+# 当前用户本地缓存：用户 ID -> 用户列值快照
+_user_snapshot_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+    maxsize=settings.CURRENT_USER_CACHE_MAXSIZE,
+    ttl=settings.CURRENT_USER_CACHE_TTL,
+)
+
+# 令牌解码本地缓存：令牌摘要 -> 已验证的令牌载荷
+_decoded_token_cache: TTLCache[bytes, dict[str, Any]] = TTLCache(
+    maxsize=settings.DECODED_TOKEN_CACHE_MAXSIZE,
+    ttl=settings.DECODED_TOKEN_CACHE_TTL,
+)
+
+# 登录成功凭据本地缓存：凭据 HMAC -> True，只缓存验证通过的凭据
+_login_ok_cache: TTLCache[bytes, bool] = TTLCache(
+    maxsize=settings.LOGIN_CACHE_MAXSIZE,
+    ttl=settings.LOGIN_CACHE_TTL,
+)
+
+# 计算登录凭据 HMAC 的密钥
+_LOGIN_CACHE_HMAC_KEY = settings.SECRET_KEY.encode()
+
+# 刷新令牌有效期，在模块加载时计算一次
+_REFRESH_TOKEN_TTL = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+# 认证路径加载用户时预先加载的关联关系。User 目前没有关联关系；为 User 增加角色、
+# 租户等关系后在此加入 `selectinload(User.roles)` 等选项，下游权限检查无需再逐条懒加载
+_AUTH_USER_LOAD_OPTIONS: tuple[ORMOption, ...] = ()
+
+
+def _login_cache_key(user: User, password: str) -> bytes:
+    """计算登录凭据的本地缓存键。
+
+    以服务端密钥对用户 ID、密码哈希和明文密码计算 HMAC，内存中不保留明文密码；
+    密码修改后哈希随之变化，旧凭据的缓存自然失效。
+
+    Args:
+        user: 用户实例。
+        password: 明文密码。
+
+    Returns:
+        32 字节的 HMAC 摘要。
+    """
+    message = f"{user.id}:{user.hashed_password}:{password}".encode()
+    return hmac.new(_LOGIN_CACHE_HMAC_KEY, message, hashlib.sha256).digest()
+
+
+def _user_claims(user: User) -> dict[str, Any]:
+    """构建写入访问令牌的用户声明。
+
+    Args:
+        user: 用户实例。
+
+    Returns:
+        用户声明，`act` 为账户是否启用，`su` 为是否为超级管理员。
+    """
+    return {"act": user.is_active, "su": user.is_superuser}
+
+
+def _token_cache_key(token: str) -> bytes:
+    """计算令牌的本地缓存键。
+
+    使用令牌摘要作为键，避免在内存中长期保留原始令牌。
+
+    Args:
+        token: JWT 令牌。
+
+    Returns:
+        16 字节的令牌摘要。
+    """
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _decode_token_cached(token: str, cache_key: bytes) -> dict[str, Any] | None:
+    """解码令牌，并在本地缓存验证通过的结果。
+
+    同一令牌的重复请求直接返回缓存的载荷，跳过 JSON 解析和签名验证。
+    解码失败的结果不缓存，缓存时间不超过令牌的剩余有效期。
+
+    Args:
+        token: JWT 令牌。
+        cache_key: 令牌摘要。
+
+    Returns:
+        解码后的令牌数据，如果令牌无效则返回 None。
+    """
+    token_data = _decoded_token_cache.get(cache_key)
+    if token_data is not None:
+        return token_data
+
+    token_data = decode_token(token)
+    if token_data is not None:
+        ttl = min(settings.DECODED_TOKEN_CACHE_TTL, token_data["exp"] - time.time())
+        _decoded_token_cache.set(cache_key, token_data, ttl=ttl)
+    return token_data
+
+
+async def _is_token_revoked(redis: Redis, token: str, cache_key: bytes) -> bool:
+    """查询 Redis 黑名单判断令牌是否已撤回，并写入本地黑名单缓存。
+
+    Args:
+        redis: Redis 客户端。
+        token: JWT 令牌。
+        cache_key: 令牌摘要。
+
+    Returns:
+        令牌是否已撤回。
+    """
+    revoked = bool(await redis.exists(_BLACKLIST_PREFIX_B + token.encode()))
+    _blacklist_cache.set(cache_key, revoked)
+    return revoked
 
 
 class AuthService:
@@ -52,18 +192,33 @@ class AuthService:
         Raises:
             BusinessException: 如果邮箱或用户名已存在。
         """
-        # 检查邮箱是否已存在
-        existing_user = await user_repo.get_by_email(db, email=user_in.email)
-        if existing_user:
-            raise BusinessException(message="邮箱已被注册")
-
-        # 检查用户名是否已存在
-        existing_user = await user_repo.get_by_username(db, username=user_in.username)
-        if existing_user:
-            raise BusinessException(message="用户名已被占用")
-
-        # 创建用户
-        user = await user_repo.create(db, obj_in=user_in)
+        # 先用布隆过滤器排除一定不存在的邮箱和用户名，只对可能存在的再查询数据库
+        email_may_exist, username_may_exist = await user_repo.may_exist(
+            email=user_in.email, username=user_in.username
+        )
+
+        # 检查邮箱和用户名是否已存在，两项检查合并为一次查询
+        if email_may_exist or username_may_exist:
+            email_taken, username_taken = await user_repo.is_email_or_username_taken(
+                db, email=user_in.email, username=user_in.username
+            )
+            if email_taken:
+                raise BusinessException(message="邮箱已被注册")
+            if username_taken:
+                raise BusinessException(message="用户名已被占用")
+
+        # 创建用户；并发注册时以数据库唯一约束兜底
+        try:
+            user = await user_repo.create(db, obj_in=user_in)
+        except IntegrityError:
+            await db.rollback()
+            raise BusinessException(message="邮箱或用户名已被占用")
+        await db.commit()
+        # 用户已经创建，缓存清理失败时只记录警告，不让客户端重试已成功的注册
+        try:
+            await user_repo.invalidate_cache(user)
+        except Exception as e:
+            logger.warning(f"用户 {user.id} 的缓存清理失败: {e}")
         return user
 
     @staticmethod
@@ -91,34 +246,55 @@ class AuthService:
         if not user:
             raise AuthenticationException(message="用户名或密码错误")
 
-        # 验证密码
-        if not verify_password(user_in.password, user.hashed_password):
-            raise AuthenticationException(message="用户名或密码错误")
+        # 验证密码；短时间内重复的正确凭据跳过密码哈希，错误的密码每次都完整验证
+        login_key = _login_cache_key(user, user_in.password)
+        new_hash = None
+        if not _login_ok_cache.get(login_key):
+            verified, new_hash = await verify_and_update_password_async(
+                user_in.password, user.hashed_password
+            )
+            if not verified:
+                raise AuthenticationException(message="用户名或密码错误")
+            if not new_hash:
+                _login_ok_cache.set(login_key, True)
 
         # 检查账户是否被禁用
         if not user.is_active:
             raise AuthenticationException(message="账户已被禁用")
 
+        # 旧算法或旧参数生成的密码哈希，登录成功时顺便升级
+        if new_hash:
+            user = await user_repo.update(
+                db, db_obj=user, obj_in={"hashed_password": new_hash}
+            )
+
         # 创建访问令牌
-        access_token = create_access_token(subject=str(user.id))
+        access_token = create_access_token(
+            subject=str(user.id), claims=_user_claims(user)
+        )
 
         # 创建刷新令牌
         refresh_token = create_refresh_token(subject=str(user.id))
 
         # 存储刷新令牌到数据库
-        from app.core.config import settings
-
-        expires_at = datetime.now(timezone.utc) + timedelta(
-            days=settings.REFRESH_TOKEN_EXPIRE_DAYS
-        )
+        expires_at = datetime.now(timezone.utc) + _REFRESH_TOKEN_TTL
         await refresh_token_repo.create(
             db,
             user_id=user.id,
-            token=refresh_token,
+            token_hash=hash_token(refresh_token),
             expires_at=expires_at,
+            flush=False,
         )
-
-        return TokenResponse(
+        await db.commit()
+        if new_hash:
+            # 缓存的用户快照包含旧的密码哈希；令牌已经签发，清理失败时只记录警告
+            try:
+                await user_repo.invalidate_cache(user)
+            except Exception as e:
+                logger.warning(f"用户 {user.id} 的缓存清理失败: {e}")
+
+        # 令牌由服务端生成，无需校验
+        return TokenResponse.model_construct(
             access_token=access_token,
             refresh_token=refresh_token,
         )
@@ -141,45 +317,48 @@ class AuthService:
         Raises:
             AuthenticationException: 如果刷新令牌无效。
         """
-        # 验证刷新令牌
+        # 验证刷新令牌。刷新令牌只能使用一次，解码结果不会再次命中，不写入解码缓存
         token_data = decode_token(refresh_token)
         if not token_data or token_data.get("type") != "refresh":
             raise AuthenticationException(message="无效的刷新令牌")
 
-        # 从数据库获取刷新令牌
-        token_obj = await refresh_token_repo.get_valid_by_token(db, token=refresh_token)
-        if not token_obj:
+        # 验证并撤回旧的刷新令牌，一次数据库往返
+        user_id = await refresh_token_repo.revoke_and_fetch(
+            db, token_hash=hash_token(refresh_token)
+        )
+        if not user_id:
             raise AuthenticationException(message="刷新令牌已过期或被撤回")
 
-        # 获取用户信息
-        user = await user_repo.get(db, id=token_obj.user_id)
+        # 获取用户信息，优先使用当前用户本地缓存的快照
+        snapshot = _user_snapshot_cache.get(str(user_id))
+        if snapshot is not None:
+            user = await user_repo.attach(db, data=snapshot)
+        else:
+            user = await user_repo.get(db, id=user_id, options=_AUTH_USER_LOAD_OPTIONS)
         if not user or not user.is_active:
             raise AuthenticationException(message="用户不存在或已被禁用")
 
-        # 撤回旧的刷新令牌
-        token_obj.revoke()
-        await db.flush()
-
         # 创建新的访问令牌
-        access_token = create_access_token(subject=str(user.id))
+        access_token = create_access_token(
+            subject=str(user.id), claims=_user_claims(user)
+        )
 
         # 创建新的刷新令牌
         new_refresh_token = create_refresh_token(subject=str(user.id))
 
         # 存储新的刷新令牌
-        from app.core.config import settings
-
-        expires_at = datetime.now(timezone.utc) + timedelta(
-            days=settings.REFRESH_TOKEN_EXPIRE_DAYS
-        )
+        expires_at = datetime.now(timezone.utc) + _REFRESH_TOKEN_TTL
         await refresh_token_repo.create(
             db,
             user_id=user.id,
-            token=new_refresh_token,
+            token_hash=hash_token(new_refresh_token),
             expires_at=expires_at,
+            flush=False,
         )
+        await db.commit()
 
-        return TokenResponse(
+        # 令牌由服务端生成，无需校验
+        return TokenResponse.model_construct(
             access_token=access_token,
             refresh_token=new_refresh_token,
         )
@@ -194,27 +373,81 @@ class AuthService:
     ) -> None:
         """用户登出。
 
+        访问令牌加入 Redis 黑名单与撤回数据库中的刷新令牌互不依赖，两者并发执行，
+        登出耗时取决于较慢的一方而不是两者之和。
+
         Args:
             db: 数据库会话。
             redis: Redis 客户端。
             access_token: 访问令牌。
             refresh_token: 刷新令牌。
         """
-        # 解码 access token 获取过期时间
+        cache_key = _token_cache_key(access_token)
+
+        # 更新本地缓存，当前进程立即拒绝该令牌
+        _blacklist_cache.set(cache_key, True)
+        _token_user_cache.pop(cache_key)
+        _decoded_token_cache.pop(cache_key)
+
+        async def _blacklist_access_token(ttl: int) -> None:
+            """添加到黑名单并通知其他 worker，两条命令合并为一次往返。"""
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.setex(_BLACKLIST_PREFIX_B + access_token.encode(), ttl, b"1")
+                pipe.publish(ACCESS_TOKEN_REVOKED_CHANNEL, cache_key.hex())
+                await pipe.execute()
+
+        async def _revoke_refresh_token() -> None:
+            """撤回刷新令牌并提交。"""
+            await refresh_token_repo.revoke(db, token_hash=hash_token(refresh_token))
+            await db.commit()
+
+        # 解码 access token 获取过期时间，计算 token 剩余有效时间
         token_data = decode_token(access_token)
+        ttl = 0
         if token_data:
-            # 计算 token 剩余有效时间
             exp = token_data.get("exp", 0)
-            now = int(datetime.now(timezone.utc).timestamp())
+            now = int(time.time())
             ttl = max(0, exp - now)
 
-            # 如果 token 还有有效期，添加到黑名单
-            if ttl > 0:
-                blacklist_key = f"{ACCESS_TOKEN_BLACKLIST_PREFIX}{access_token}"
-                await redis.setex(blacklist_key, ttl, "1")
+        # 如果 token 还有有效期，加入黑名单与撤回刷新令牌并发执行；等待两者都结束后
+        # 再抛出异常，避免一方失败时另一方仍在使用数据库会话
+        if ttl > 0:
+            results = await asyncio.gather(
+                _blacklist_access_token(ttl),
+                _revoke_refresh_token(),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        else:
+            await _revoke_refresh_token()
 
-        # 撤回刷新令牌
-        await refresh_token_repo.revoke(db, token=refresh_token)
+    @staticmethod
+    async def purge_expired_refresh_tokens(
+        db: AsyncSession,
+        *,
+        batch_size: int = settings.REFRESH_TOKEN_PURGE_BATCH_SIZE,
+    ) -> int:
+        """分批清理过期的刷新令牌。
+
+        每批删除后立即提交，缩短事务和行锁的持有时间，不阻塞正常的令牌刷新。
+        应由定时任务调用，而不是在请求处理中调用。
+
+        Args:
+            db: 数据库会话。
+            batch_size: 每批删除的记录数。
+
+        Returns:
+            删除的记录总数。
+        """
+        total = 0
+        while True:
+            deleted = await refresh_token_repo.delete_expired(db, limit=batch_size)
+            await db.commit()
+            total += deleted
+            if deleted < batch_size:
+                return total
 
     @staticmethod
     async def get_current_user(
@@ -237,13 +470,24 @@ class AuthService:
             AuthenticationException: 如果令牌无效或在黑名单中。
             ResourceNotFoundException: 如果用户不存在。
         """
-        # 检查 token 是否在黑名单中
-        blacklist_key = f"{ACCESS_TOKEN_BLACKLIST_PREFIX}{token}"
-        if await redis.exists(blacklist_key):
+        cache_key = _token_cache_key(token)
+
+        # 检查 token 是否在黑名单中；本地缓存未命中时为 None，稍后再查询 Redis
+        revoked = _blacklist_cache.get(cache_key)
+        if revoked:
             raise AuthenticationException(message="令牌已失效")
 
+        # 命中本地缓存时直接重建用户实例，跳过令牌解码和数据库查询
+        cached_user_id = _token_user_cache.get(cache_key)
+        if cached_user_id is not None:
+            snapshot = _user_snapshot_cache.get(cached_user_id)
+            if snapshot is not None:
+                if revoked is None and await _is_token_revoked(redis, token, cache_key):
+                    raise AuthenticationException(message="令牌已失效")
+                return await user_repo.attach(db, data=snapshot)
+
         # 解码令牌
-        token_data = decode_token(token)
+        token_data = _decode_token_cached(token, cache_key)
         if not token_data or token_data.get("type") != "access":
             raise AuthenticationException(message="无效的访问令牌")
 
@@ -252,12 +496,140 @@ class AuthService:
         if not user_id:
             raise AuthenticationException(message="无效的令牌载荷")
 
-        # 获取用户
-        user = await user_repo.get(db, id=user_id)
+        # 获取用户；黑名单本地缓存未命中时，Redis 查询与数据库查询并发执行。
+        # 等待两者都结束后再抛出异常，避免 Redis 失败时数据库查询仍在使用会话
+        if revoked is None:
+            revoked_result, user_result = await asyncio.gather(
+                _is_token_revoked(redis, token, cache_key),
+                user_repo.get(db, id=user_id, options=_AUTH_USER_LOAD_OPTIONS),
+                return_exceptions=True,
+            )
+            if isinstance(revoked_result, BaseException):
+                raise revoked_result
+            if isinstance(user_result, BaseException):
+                raise user_result
+            revoked, user = revoked_result, user_result
+            if revoked:
+                raise AuthenticationException(message="令牌已失效")
+        else:
+            user = await user_repo.get(db, id=user_id, options=_AUTH_USER_LOAD_OPTIONS)
         if not user:
             raise ResourceNotFoundException(message="用户不存在")
 
         if not user.is_active:
             raise AuthenticationException(message="账户已被禁用")
 
+        # 写入本地缓存，缓存时间不超过令牌的剩余有效期
+        ttl = min(settings.CURRENT_USER_CACHE_TTL, token_data["exp"] - time.time())
+        _token_user_cache.set(cache_key, str(user.id), ttl=ttl)
+        _user_snapshot_cache.set(str(user.id), user_repo.snapshot(user))
+
         return user
+
+    @staticmethod
+    async def get_current_user_claims(
+        db: AsyncSession,
+        redis: Redis,
+        *,
+        token: str,
+    ) -> TokenClaims:
+        """获取当前用户的令牌声明。
+
+        直接信任访问令牌中签发时写入的账户状态和权限，只检查令牌黑名单，不查询数据库，
+        适用于只做权限检查、不需要完整用户信息的端点。缺少用户声明的旧令牌退回到
+        `get_current_user` 加载用户。
+
+        Args:
+            db: 数据库会话。
+            redis: Redis 客户端。
+            token: 访问令牌。
+
+        Returns:
+            当前用户的令牌声明。
+
+        Raises:
+            AuthenticationException: 如果令牌无效、在黑名单中或账户已被禁用。
+            ResourceNotFoundException: 如果用户不存在（仅旧令牌）。
+        """
+        cache_key = _token_cache_key(token)
+
+        # 检查 token 是否在黑名单中；本地缓存未命中时为 None，稍后再查询 Redis
+        revoked = _blacklist_cache.get(cache_key)
+        if revoked:
+            raise AuthenticationException(message="令牌已失效")
+
+        # 解码令牌
+        token_data = _decode_token_cached(token, cache_key)
+        if not token_data or token_data.get("type") != "access":
+            raise AuthenticationException(message="无效的访问令牌")
+
+        if "act" not in token_data or "su" not in token_data:
+            user = await AuthService.get_current_user(db, redis=redis, token=token)
+            return TokenClaims.model_construct(
+                id=user.id, is_active=user.is_active, is_superuser=user.is_superuser
+            )
+
+        if revoked is None and await _is_token_revoked(redis, token, cache_key):
+            raise AuthenticationException(message="令牌已失效")
+
+        if not token_data["act"]:
+            raise AuthenticationException(message="账户已被禁用")
+
+        try:
+            user_id = uuid.UUID(token_data["sub"])
+        except ValueError:
+            raise AuthenticationException(message="无效的令牌载荷")
+
+        # 声明来自已验证签名的令牌，无需校验
+        return TokenClaims.model_construct(
+            id=user_id, is_active=True, is_superuser=bool(token_data["su"])
+        )
+
+    @staticmethod
+    async def invalidate_user_cache(redis: Redis, user_id: Any) -> None:
+        """使用户的本地缓存失效，并通知其他 worker 清理各自的缓存。
+
+        在用户信息被修改或删除后调用，确保后续请求重新从数据库加载，
+        被禁用或删除的用户在其他 worker 上也无法继续凭缓存的快照通过认证。
+
+        Args:
+            redis: Redis 客户端。
+            user_id: 用户 ID。
+        """
+        cache_key = str(user_id)
+        _user_snapshot_cache.pop(cache_key)
+        await redis.publish(USER_SNAPSHOT_INVALIDATED_CHANNEL, cache_key)
+
+    @staticmethod
+    async def listen_cache_invalidations(redis: Redis) -> None:
+        """订阅令牌撤回和用户快照失效通知并更新本地缓存。
+
+        其他 worker 登出时会发布令牌摘要，收到后立即将其标记为已撤回；
+        修改或删除用户时会发布用户 ID，收到后清理该用户的快照。
+        本地缓存因此不必等到过期才感知变化。连接中断时每秒重试一次，
+        应作为后台任务在应用生命周期内运行。
+
+        Args:
+            redis: Redis 客户端。
+        """
+        while True:
+            try:
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(
+                        ACCESS_TOKEN_REVOKED_CHANNEL, USER_SNAPSHOT_INVALIDATED_CHANNEL
+                    )
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        if message["channel"] == USER_SNAPSHOT_INVALIDATED_CHANNEL:
+                            _user_snapshot_cache.pop(message["data"])
+                            continue
+                        cache_key = bytes.fromhex(message["data"])
+                        _blacklist_cache.set(cache_key, True)
+                        _token_user_cache.pop(cache_key)
+                        _decoded_token_cache.pop(cache_key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"认证缓存失效订阅中断，1 秒后重试: {e}")
+                await asyncio.sleep(1)
@@ -3,15 +3,116 @@
 提供用户管理相关的业务逻辑。
 """
 
+import asyncio
+import base64
+import binascii
+import uuid
+from datetime import datetime
 from typing import Any
 
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.logging import logger
 from app.crud.user_repo import user_repo
-from app.exceptions import BusinessException, ResourceNotFoundException
+from app.exceptions import BusinessException, ResourceNotFoundException, ValidationException
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import UserCreate, UserResponse, UserUpdate
 from app.schemas.base import PageResponse
+from app.services.auth_service import AuthService
+
+# 用户列表响应所需的列
+_USER_RESPONSE_COLUMNS = tuple(getattr(User, field) for field in UserResponse.model_fields)
+
+# OFFSET 分页跳过的记录数超过该值时记录警告，提示改用游标分页
+_DEEP_OFFSET_WARNING = 1000
+
+
+async def _invalidate_user_caches(
+    redis: Redis,
+    user: User,
+    *,
+    previous_email: str | None = None,
+    previous_username: str | None = None,
+) -> None:
+    """事务提交后清理用户的查询缓存和认证快照。
+
+    写入已经提交，清理失败时只记录警告，不把已生效的写操作变成错误响应，
+    以免客户端重试已经成功的写入；残留的缓存最迟在各自的 TTL 到期后失效。
+
+    Args:
+        redis: Redis 客户端。
+        user: 用户实例。
+        previous_email: 修改前的邮箱。
+        previous_username: 修改前的用户名。
+    """
+    results = await asyncio.gather(
+        user_repo.invalidate_cache(
+            user, previous_email=previous_email, previous_username=previous_username
+        ),
+        AuthService.invalidate_user_cache(redis, user.id),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"用户 {user.id} 的缓存清理失败: {result}")
+        elif isinstance(result, BaseException):
+            raise result
+
+
+async def _get_user_by_id(db: AsyncSession, user_id: str | uuid.UUID) -> User | None:
+    """根据 ID 获取用户。
+
+    会话的标识映射以 UUID 为键，先将字符串 ID 转为 UUID，同一会话中已加载的用户
+    直接从标识映射返回，不再查询数据库；无法解析的 ID 直接视为用户不存在。
+
+    Args:
+        db: 数据库会话。
+        user_id: 用户 ID。
+
+    Returns:
+        用户实例，如果不存在则返回 None。
+    """
+    if not isinstance(user_id, uuid.UUID):
+        try:
+            user_id = uuid.UUID(user_id)
+        except ValueError:
+            return None
+    return await user_repo.get(db, id=user_id)
+
+
+def _encode_cursor(created_at: datetime, user_id: uuid.UUID) -> str:
+    """将用户的排序键编码为分页游标。
+
+    Args:
+        created_at: 用户创建时间。
+        user_id: 用户 ID。
+
+    Returns:
+        URL 安全的 Base64 游标字符串。
+    """
+    raw = f"{created_at.isoformat()}|{user_id}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """解码分页游标。
+
+    Args:
+        cursor: 游标字符串。
+
+    Returns:
+        (创建时间, 用户 ID) 元组。
+
+    Raises:
+        ValidationException: 如果游标格式无效。
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, user_id = raw.split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(user_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationException(message="无效的分页游标")
 
 
 class UserService:
@@ -21,13 +122,13 @@ class UserService:
     async def get_user(
         db: AsyncSession,
         *,
-        user_id: str,
+        user_id: str | uuid.UUID,
     ) -> User:
         """获取用户信息。
 
         Args:
             db: 数据库会话。
-            user_id: 用户 ID。
+            user_id: 用户 ID，传入 UUID 时跳过解析。
 
         Returns:
             用户实例。
@@ -35,7 +136,7 @@ class UserService:
         Raises:
             ResourceNotFoundException: 如果用户不存在。
         """
-        user = await user_repo.get(db, id=user_id)
+        user = await _get_user_by_id(db, user_id)
         if not user:
             raise ResourceNotFoundException(message="用户不存在")
         return user
@@ -60,6 +161,7 @@ class UserService:
     @staticmethod
     async def update_user_me(
         db: AsyncSession,
+        redis: Redis,
         *,
         current_user: User,
         user_in: UserUpdate,
@@ -68,6 +170,7 @@ class UserService:
 
         Args:
             db: 数据库会话。
+            redis: Redis 客户端。
             current_user: 当前用户实例。
             user_in: 更新数据。
 
@@ -83,20 +186,28 @@ class UserService:
             if existing_user and existing_user.id != current_user.id:
                 raise BusinessException(message="邮箱已被使用")
 
-        return await user_repo.update(db, db_obj=current_user, obj_in=user_in)
+        previous_email, previous_username = current_user.email, current_user.username
+        user = await user_repo.update(db, db_obj=current_user, obj_in=user_in)
+        await db.commit()
+        await _invalidate_user_caches(
+            redis, user, previous_email=previous_email, previous_username=previous_username
+        )
+        return user
 
     @staticmethod
     async def update_user(
         db: AsyncSession,
+        redis: Redis,
         *,
-        user_id: str,
+        user_id: str | uuid.UUID,
         user_in: UserUpdate,
     ) -> User:
         """更新用户信息。
 
         Args:
             db: 数据库会话。
-            user_id: 用户 ID。
+            redis: Redis 客户端。
+            user_id: 用户 ID，传入 UUID 时跳过解析。
             user_in: 更新数据。
 
         Returns:
@@ -106,7 +217,7 @@ class UserService:
             ResourceNotFoundException: 如果用户不存在。
             BusinessException: 如果邮箱已被其他用户使用。
         """
-        user = await user_repo.get(db, id=user_id)
+        user = await _get_user_by_id(db, user_id)
         if not user:
             raise ResourceNotFoundException(message="用户不存在")
 
@@ -116,29 +227,38 @@ class UserService:
             if existing_user and existing_user.id != user.id:
                 raise BusinessException(message="邮箱已被使用")
 
-        return await user_repo.update(db, db_obj=user, obj_in=user_in)
+        previous_email, previous_username = user.email, user.username
+        user = await user_repo.update(db, db_obj=user, obj_in=user_in)
+        await db.commit()
+        await _invalidate_user_caches(
+            redis, user, previous_email=previous_email, previous_username=previous_username
+        )
+        return user
 
     @staticmethod
     async def delete_user(
         db: AsyncSession,
+        redis: Redis,
         *,
-        user_id: str,
+        user_id: str | uuid.UUID,
     ) -> None:
         """删除用户（软删除）。
 
         Args:
             db: 数据库会话。
-            user_id: 用户 ID。
+            redis: Redis 客户端。
+            user_id: 用户 ID，传入 UUID 时跳过解析。
 
         Raises:
             ResourceNotFoundException: 如果用户不存在。
         """
-        user = await user_repo.get(db, id=user_id)
+        user = await _get_user_by_id(db, user_id)
         if not user:
             raise ResourceNotFoundException(message="用户不存在")
 
         user.soft_delete()
-        await db.flush()
+        await db.commit()
+        await _invalidate_user_caches(redis, user)
 
     @staticmethod
     async def get_users(
@@ -146,26 +266,69 @@ class UserService:
         *,
         skip: int = 0,
         limit: int = 20,
-    ) -> PageResponse:
+        with_total: bool = False,
+        cursor: str | None = None,
+    ) -> PageResponse[UserResponse]:
         """获取用户列表。
 
+        默认只判断是否有下一页，不统计用户总数。传入游标时使用键集分页，
+        查询代价与页码深度无关；首页不统计总数时同样使用键集分页并返回下一页游标。
+        `skip` 仅为兼容保留，深度 OFFSET 分页需要扫描并丢弃被跳过的行。
+
         Args:
             db: 数据库会话。
-            skip: 跳过的记录数。
+            skip: 跳过的记录数，传入游标时忽略。
             limit: 返回的最大记录数。
+            with_total: 是否统计用户总数。
+            cursor: 上一页返回的 `next_cursor`。
 
         Returns:
             分页响应。
+
+        Raises:
+            ValidationException: 如果游标格式无效。
         """
-        users = await user_repo.get_multi(db, skip=skip, limit=limit)
-        total = await user_repo.count(db)
+        total: int | None = None
+        has_next: bool | None = None
+        # 只查询响应需要的列，不加载密码哈希等字段，也不构建 ORM 实例
+        if cursor is not None or (skip == 0 and not with_total):
+            after = _decode_cursor(cursor) if cursor is not None else None
+            users, has_next = await user_repo.get_multi_after(
+                db, after=after, limit=limit, columns=_USER_RESPONSE_COLUMNS
+            )
+            if with_total:
+                total = await user_repo.count(db)
+            next_cursor = None
+            if has_next:
+                next_cursor = _encode_cursor(users[-1].created_at, users[-1].id)
+            return PageResponse[UserResponse].create(
+                items=[UserResponse.from_orm_fast(user) for user in users],
+                total=total,
+                page=None if cursor is not None else 1,
+                size=limit,
+                has_next=has_next,
+                has_prev=cursor is not None,
+                next_cursor=next_cursor,
+            )
+
+        if skip > _DEEP_OFFSET_WARNING:
+            logger.warning("深度 OFFSET 分页: skip={}，建议改用游标分页", skip)
+        if with_total:
+            users, total = await user_repo.get_multi_with_total(
+                db, skip=skip, limit=limit, columns=_USER_RESPONSE_COLUMNS
+            )
+        else:
+            users, has_next = await user_repo.get_multi_plus_one(
+                db, skip=skip, limit=limit, columns=_USER_RESPONSE_COLUMNS
+            )
 
         # 计算当前页码
         page = skip // limit + 1 if limit > 0 else 1
 
-        return PageResponse.create(
-            items=users,
+        return PageResponse[UserResponse].create(
+            items=[UserResponse.from_orm_fast(user) for user in users],
             total=total,
             page=page,
             size=limit,
+            has_next=has_next,
         )
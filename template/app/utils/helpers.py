@@ -6,25 +6,64 @@
 import hashlib
 import secrets
 import string
+from functools import lru_cache
 from typing import Any
 
+# 随机字符串字母表（大小写字母和数字）
+_RANDOM_ALPHABET = (string.ascii_letters + string.digits).encode()
+
+# 随机字节到字母表字符的映射表；不小于 248（62 的最大整数倍）的字节会被丢弃，
+# 保证每个字符的概率相同，没有取模偏差
+_RANDOM_UNBIASED_LIMIT = 256 - 256 % len(_RANDOM_ALPHABET)
+_RANDOM_CHAR_TABLE = bytes(
+    _RANDOM_ALPHABET[b % len(_RANDOM_ALPHABET)] for b in range(256)
+)
+_RANDOM_REJECTED_BYTES = bytes(range(_RANDOM_UNBIASED_LIMIT, 256))
+
+# 常用哈希算法的专用构造函数，比 hashlib.new 按名称查找算法更快
+_HASH_CONSTRUCTORS = {
+    "md5": hashlib.md5,
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+}
+
+# 长字符串分块编码的块大小（字符数），避免一次性复制出整段字节
+_HASH_CHUNK_SIZE = 65536
+
+# deep_get 中表示键不存在的哨兵值，与值为 None 的键区分
+_MISSING = object()
+
 
 def generate_random_string(length: int = 32) -> str:
     """生成随机字符串。
 
+    一次性获取随机字节，再通过 `bytes.translate` 映射为字母表字符，
+    避免逐字符调用 `secrets.choice`。
+
     Args:
         length: 字符串长度。
 
     Returns:
-        随机字符串。
+        由大小写字母和数字组成的随机字符串。
     """
-    alphabet = string.ascii_letters + string.digits
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+    result = b""
+    while len(result) < length:
+        # 多取少量字节，补偿被丢弃的字节，通常一次即可取够
+        raw = secrets.token_bytes(length - len(result) + 8)
+        result += raw.translate(_RANDOM_CHAR_TABLE, _RANDOM_REJECTED_BYTES)
+    return result[:length].decode("ascii")
 
 
-def generate_hash(content: str, algorithm: str = "sha256") -> str:
+def generate_hash(
+    content: str | bytes | memoryview,
+    algorithm: str = "sha256",
+) -> str:
     """生成内容的哈希值。
 
+    字节内容直接交给哈希函数，字符串按 UTF-8 编码，超长字符串分块编码，
+    峰值内存不随内容长度增长。
+
     Args:
         content: 要哈希的内容。
         algorithm: 哈希算法，默认为 sha256。
@@ -32,8 +71,16 @@ def generate_hash(content: str, algorithm: str = "sha256") -> str:
     Returns:
         十六进制哈希字符串。
     """
-    hash_func = hashlib.new(algorithm)
-    hash_func.update(content.encode("utf-8"))
+    constructor = _HASH_CONSTRUCTORS.get(algorithm)
+    hash_func = constructor() if constructor else hashlib.new(algorithm)
+
+    if not isinstance(content, str):
+        hash_func.update(content)
+    elif len(content) <= _HASH_CHUNK_SIZE:
+        hash_func.update(content.encode("utf-8"))
+    else:
+        for start in range(0, len(content), _HASH_CHUNK_SIZE):
+            hash_func.update(content[start : start + _HASH_CHUNK_SIZE].encode("utf-8"))
     return hash_func.hexdigest()
 
 
@@ -109,13 +156,28 @@ def deep_get(
         >>> deep_get(data, "user.profile.age", 0)
         0
     """
-    keys = key_path.split(".")
-    value = data
-
-    for key in keys:
-        if isinstance(value, dict) and key in value:
-            value = value[key]
-        else:
+    value: Any = data
+    for key in _split_key_path(key_path):
+        # 绝大多数值就是 dict，先做精确类型判断，子类再走 isinstance
+        if type(value) is not dict and not isinstance(value, dict):
+            return default
+        value = value.get(key, _MISSING)
+        if value is _MISSING:
             return default
 
     return value
+
+
+@lru_cache(maxsize=1024)
+def _split_key_path(key_path: str) -> tuple[str, ...]:
+    """拆分键路径。
+
+    同样的键路径会被反复查询，缓存拆分结果以避免每次调用都创建新列表。
+
+    Args:
+        key_path: 用点号分隔的键路径。
+
+    Returns:
+        键元组。
+    """
+    return tuple(key_path.split("."))
@@ -4,8 +4,27 @@
 """
 
 import re
+import string
 from typing import Any
 
+# 用户名：以字母开头，只包含字母、数字、下划线和连字符，长度 3-50，长度由正则一并约束
+_USERNAME_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9_-]{2,49}")
+
+# 密码强度：各字符类别的检查，用于定位具体的错误原因
+_PWD_SPECIAL_CHARS = '!@#$%^&*(),.?":{}|<>'
+_PWD_UPPER = re.compile(r"[A-Z]")
+_PWD_LOWER = re.compile(r"[a-z]")
+_PWD_DIGIT = re.compile(r"\d")
+_PWD_SPECIAL = re.compile(f"[{re.escape(_PWD_SPECIAL_CHARS)}]")
+
+# 字符类别映射表：把每个字符映射为其类别的代表字符，一次 str.translate 即可得到
+# 密码包含的全部字符类别，无需多次扫描
+_PWD_CLASS_TABLE = str.maketrans(
+    string.ascii_uppercase + string.ascii_lowercase + string.digits + _PWD_SPECIAL_CHARS,
+    "A" * 26 + "a" * 26 + "0" * 10 + "!" * len(_PWD_SPECIAL_CHARS),
+)
+_PWD_REQUIRED_CLASSES = frozenset("Aa0!")
+
 
 def validate_username(username: str) -> bool:
     """验证用户名格式。
@@ -21,10 +40,7 @@ def validate_username(username: str) -> bool:
     Returns:
         是否有效。
     """
-    if not username or len(username) < 3 or len(username) > 50:
-        return False
-    pattern = r"^[a-zA-Z][a-zA-Z0-9_-]*$"
-    return bool(re.match(pattern, username))
+    return bool(username) and _USERNAME_RE.fullmatch(username) is not None
 
 
 def validate_password_strength(password: str) -> tuple[bool, str]:
@@ -46,16 +62,20 @@ def validate_password_strength(password: str) -> tuple[bool, str]:
     if not password or len(password) < 8:
         return False, "密码长度至少为 8 个字符"
 
-    if not re.search(r"[A-Z]", password):
+    # 大多数密码满足全部条件，先一次遍历得到全部字符类别，失败时再逐项定位原因
+    if _PWD_REQUIRED_CLASSES.issubset(password.translate(_PWD_CLASS_TABLE)):
+        return True, ""
+
+    if not _PWD_UPPER.search(password):
         return False, "密码必须包含至少一个大写字母"
 
-    if not re.search(r"[a-z]", password):
+    if not _PWD_LOWER.search(password):
         return False, "密码必须包含至少一个小写字母"
 
-    if not re.search(r"\d", password):
+    if not _PWD_DIGIT.search(password):
         return False, "密码必须包含至少一个数字"
 
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if not _PWD_SPECIAL.search(password):
         return False, "密码必须包含至少一个特殊字符"
 
     return True, ""
@@ -13,7 +13,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.cache import get_redis
 from app.core.database import async_session_maker
-from app.core.security import get_password_hash
 from app.core.logging import logger
 from app.crud.user_repo import user_repo
 from app.models.user import User
@@ -56,15 +55,19 @@ async def create_admin_user(
             logger.warning(f"管理员用户名已存在: {username}")
             return existing_user
 
-        # 创建用户
-        user = await user_repo.create(db, obj_in=user_in)
-
-        # 设置为超级管理员和已验证
-        user.is_superuser = True
-        user.is_verified = True
-        user.is_active = True
+        # 创建用户，超级管理员和已验证标记随 INSERT 一并写入，无需再执行一次 UPDATE
+        user = await user_repo.create(
+            db,
+            obj_in={
+                **user_in.model_dump(),
+                "is_superuser": True,
+                "is_verified": True,
+                "is_active": True,
+            },
+        )
 
         await db.commit()
+        await user_repo.invalidate_cache(user)
         await db.refresh(user)
 
         logger.info(f"管理员用户创建成功: {user.email} (username: {user.username})")
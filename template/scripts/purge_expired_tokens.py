@@ -0,0 +1,34 @@
+"""清理过期刷新令牌脚本。
+
+分批删除已过期的刷新令牌，建议通过 cron 等定时任务定期执行。
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 sys.path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.database import async_session_maker, close_db
+from app.core.logging import logger
+from app.services.auth_service import AuthService
+
+
+async def main() -> None:
+    """主函数。"""
+    logger.info("开始清理过期刷新令牌...")
+
+    try:
+        async with async_session_maker() as db:
+            deleted = await AuthService.purge_expired_refresh_tokens(db)
+        logger.info(f"过期刷新令牌清理完成，共删除 {deleted} 条")
+    except Exception as e:
+        logger.error(f"清理过期刷新令牌失败: {e}")
+        sys.exit(1)
+    finally:
+        await close_db()
+        await logger.complete()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,45 +3,74 @@
 填充测试数据到数据库。"""
 import asyncio
 import sys
+from collections.abc import Sequence
 from pathlib import Path
 
 # 添加项目根目录到 sys.path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import async_session_maker
-from app.core.security import get_password_hash
 from app.core.logging import logger
+from app.crud.user_repo import user_repo
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.services.auth_service import AuthService
 
+# 测试用户
+TEST_USERS = [
+    UserCreate(
+        email="test@example.com",
+        username="testuser",
+        password="Test1234!",
+        full_name="测试用户",
+    ),
+]
 
-async def create_test_user(db: AsyncSession) -> None:
-    """创建测试用户。
+
+async def seed_users(db: AsyncSession, user_specs: Sequence[UserCreate]) -> int:
+    """批量创建测试用户。
+
+    一次查询过滤掉邮箱或用户名已存在的用户，其余用户的密码哈希并发计算后批量插入，
+    提交后清理这些用户的查询缓存。
 
     Args:
         db: 数据库会话。
-    """
-    # 检查是否已存在测试用户
-    from app.crud.user_repo import user_repo
+        user_specs: 测试用户列表。
 
-    existing_user = await user_repo.get_by_email(db, email="test@example.com")
-    if existing_user:
-        logger.info("测试用户已存在，跳过创建")
-        return
-
-    # 创建测试用户
-    user_in = UserCreate(
-        email="test@example.com",
-        username="testuser",
-        password="Test1234!",
-        full_name="测试用户",
+    Returns:
+        创建的用户数量。
+    """
+    # 检查已存在的测试用户
+    result = await db.execute(
+        select(User.email, User.username).where(
+            or_(
+                User.email.in_([spec.email for spec in user_specs]),
+                User.username.in_([spec.username for spec in user_specs]),
+            )
+        )
     )
-
-    user = await AuthService.register(db, user_in=user_in)
-    logger.info(f"创建测试用户成功: {user.email}")
+    existing = set()
+    for row in result:
+        existing.add(row.email.lower())
+        existing.add(row.username)
+
+    new_specs = [
+        spec
+        for spec in user_specs
+        if spec.email.lower() not in existing and spec.username not in existing
+    ]
+    skipped = len(user_specs) - len(new_specs)
+    if skipped:
+        logger.info(f"{skipped} 个测试用户已存在，跳过创建")
+
+    # 批量创建测试用户
+    created = await user_repo.create_many(db, objs_in=new_specs)
+    await db.commit()
+    await user_repo.invalidate_cache_many([(spec.email, spec.username) for spec in new_specs])
+    logger.info(f"创建测试用户成功: {created} 个")
+    return created
 
 
 async def main() -> None:
@@ -49,8 +78,7 @@ async def main() -> None:
     logger.info("开始填充测试数据...")
 
     async with async_session_maker() as db:
-        await create_test_user(db)
-        await db.commit()
+        await seed_users(db, TEST_USERS)
 
     logger.info("测试数据填充完成")
 
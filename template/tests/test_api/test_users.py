@@ -1,5 +1,8 @@
 """用户 API 测试。"""
 import pytest
+from httpx import AsyncClient
+
+from app.core.security import create_access_token
 
 
 @pytest.mark.asyncio
@@ -7,12 +10,16 @@ class TestUsersAPI:
     """用户 API 测试类。"""
 
     async def test_get_users(
-        self, client: AsyncClient, auth_headers: dict
+        self, client: AsyncClient, test_user: dict
     ) -> None:
         """测试获取用户列表。"""
+        # 用户列表仅超级管理员可访问
+        token = create_access_token(
+            subject=str(test_user["id"]), claims={"act": True, "su": True}
+        )
         response = await client.get(
             "/api/v1/users",
-            headers=auth_headers,
+            headers={"Authorization": f"Bearer {token}"},
         )
 
         assert response.status_code == 200
@@ -54,6 +61,99 @@ class TestUsersAPI:
 
         assert response.status_code == 401
 
+    async def test_get_user_requires_superuser(
+        self, client: AsyncClient, auth_headers: dict, test_user: dict
+    ) -> None:
+        """测试普通用户无法获取指定用户信息。"""
+        response = await client.get(
+            f"/api/v1/users/{test_user['id']}",
+            headers=auth_headers,
+        )
 
-# 导入 AsyncClient 类型
-from httpx import AsyncClient
+        assert response.status_code == 403
+        data = response.json()
+        assert data["code"] == 403
+
+    async def test_get_user_trusts_superuser_claim(
+        self, client: AsyncClient, test_user: dict
+    ) -> None:
+        """测试超级管理员权限直接取自令牌声明，不查询数据库中的用户。"""
+        token = create_access_token(
+            subject=str(test_user["id"]), claims={"act": True, "su": True}
+        )
+
+        response = await client.get(
+            f"/api/v1/users/{test_user['id']}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"]["email"] == test_user["email"]
+
+    async def test_update_user_checks_superuser_in_database(
+        self, client: AsyncClient, test_user: dict
+    ) -> None:
+        """测试修改用户时不信任令牌声明，从数据库校验管理员权限。"""
+        # 模拟已被取消管理员权限、但令牌尚未过期的用户
+        token = create_access_token(
+            subject=str(test_user["id"]), claims={"act": True, "su": True}
+        )
+
+        response = await client.patch(
+            f"/api/v1/users/{test_user['id']}",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"full_name": "不应生效"},
+        )
+
+        assert response.status_code == 403
+
+    async def test_get_user_legacy_token_without_claims(
+        self, client: AsyncClient, test_user: dict
+    ) -> None:
+        """测试缺少用户声明的旧令牌退回到从数据库加载用户。"""
+        token = create_access_token(subject=str(test_user["id"]))
+
+        response = await client.get(
+            f"/api/v1/users/{test_user['id']}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        # 认证通过，但数据库中的用户不是超级管理员
+        assert response.status_code == 403
+
+    async def test_get_user_inactive_claim(
+        self, client: AsyncClient, test_user: dict
+    ) -> None:
+        """测试令牌声明账户已被禁用时拒绝访问。"""
+        token = create_access_token(
+            subject=str(test_user["id"]), claims={"act": False, "su": True}
+        )
+
+        response = await client.get(
+            f"/api/v1/users/{test_user['id']}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 401
+
+    async def test_get_user_revoked_token(
+        self, client: AsyncClient, test_user: dict
+    ) -> None:
+        """测试登出后的访问令牌无法通过声明认证。"""
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"username": test_user["username"], "password": test_user["password"]},
+        )
+        tokens = response.json()["data"]
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        response = await client.post(
+            "/api/v1/auth/logout",
+            params={"refresh_token": tokens["refresh_token"]},
+            headers=headers,
+        )
+        assert response.status_code == 200
+
+        response = await client.get(f"/api/v1/users/{test_user['id']}", headers=headers)
+
+        assert response.status_code == 401
@@ -0,0 +1,53 @@
+"""缓存工具测试。"""
+import uuid
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+
+from app.core.cache import BloomFilter, get_redis
+
+
+@pytest_asyncio.fixture(scope="function")
+async def bloom_filter() -> AsyncGenerator[BloomFilter, None]:
+    """创建使用独立键的布隆过滤器，测试结束后删除位图和就绪标记。
+
+    Yields:
+        布隆过滤器。
+    """
+    bloom = BloomFilter(f"bloom:test:{uuid.uuid4().hex}", capacity=1000, error_rate=0.001)
+
+    yield bloom
+
+    redis = await get_redis()
+    await redis.unlink(bloom.key, bloom.ready_key)
+
+
+@pytest.mark.asyncio
+class TestBloomFilter:
+    """布隆过滤器测试类。"""
+
+    async def test_not_ready_might_contain_anything(self, bloom_filter: BloomFilter) -> None:
+        """测试未就绪时所有元素都视为可能存在。"""
+        redis = await get_redis()
+
+        assert await bloom_filter.is_ready(redis) is False
+        assert await bloom_filter.might_contain(
+            redis, "email:alice@example.com", "username:alice"
+        ) == [True, True]
+
+    async def test_might_contain_after_add(self, bloom_filter: BloomFilter) -> None:
+        """测试就绪后已添加的元素可能存在，未添加的元素一定不存在。"""
+        redis = await get_redis()
+
+        await bloom_filter.add(redis, "email:alice@example.com", "username:alice")
+        await bloom_filter.mark_ready(redis)
+
+        assert await bloom_filter.is_ready(redis) is True
+        assert await bloom_filter.might_contain(
+            redis,
+            "email:alice@example.com",
+            "username:alice",
+            "email:bob@example.com",
+            "username:bob",
+        ) == [True, True, False, False]
@@ -1,5 +1,6 @@
 """用户数据访问层测试。"""
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 @pytest.mark.asyncio
@@ -24,6 +25,7 @@ class TestUserRepo:
         assert user.username == "repouser"
         assert user.hashed_password is not None
 
+    @pytest.mark.usefixtures("clear_user_cache")
     async def test_get_by_email(self, db_session: AsyncSession, test_user: dict) -> None:
         """测试通过邮箱获取用户。"""
         from app.crud.user_repo import user_repo
@@ -33,6 +35,19 @@ class TestUserRepo:
         assert user is not None
         assert user.email == test_user["email"]
 
+    @pytest.mark.usefixtures("clear_user_cache")
+    async def test_get_by_email_case_insensitive(
+        self, db_session: AsyncSession, test_user: dict
+    ) -> None:
+        """测试通过邮箱获取用户时不区分大小写。"""
+        from app.crud.user_repo import user_repo
+
+        user = await user_repo.get_by_email(db_session, email=test_user["email"].upper())
+
+        assert user is not None
+        assert user.email == test_user["email"]
+
+    @pytest.mark.usefixtures("clear_user_cache")
     async def test_get_by_username(self, db_session: AsyncSession, test_user: dict) -> None:
         """测试通过用户名获取用户。"""
         from app.crud.user_repo import user_repo
@@ -41,3 +56,67 @@ class TestUserRepo:
 
         assert user is not None
         assert user.username == test_user["username"]
+
+    @pytest.mark.usefixtures("clear_user_cache")
+    async def test_get_by_email_or_username(
+        self, db_session: AsyncSession, test_user: dict
+    ) -> None:
+        """测试通过邮箱或用户名获取用户。"""
+        from app.crud.user_repo import user_repo
+
+        by_email = await user_repo.get_by_email_or_username(
+            db_session, email_or_username=test_user["email"]
+        )
+        by_username = await user_repo.get_by_email_or_username(
+            db_session, email_or_username=test_user["username"]
+        )
+        missing = await user_repo.get_by_email_or_username(
+            db_session, email_or_username="missing@example.com"
+        )
+
+        assert by_email is not None and by_email.id == test_user["id"]
+        assert by_username is by_email
+        assert missing is None
+
+    async def test_get_multi_with_total(
+        self, db_session: AsyncSession, test_user: dict, seeded_users: list[dict]
+    ) -> None:
+        """测试单次查询获取用户列表及总数。"""
+        from app.crud.user_repo import user_repo
+
+        users, total = await user_repo.get_multi_with_total(db_session, skip=0, limit=10)
+
+        assert total == len(seeded_users) + 1
+        assert users[0].email == test_user["email"]
+        assert sorted(user.email for user in users[1:]) == sorted(
+            seeded_user["email"] for seeded_user in seeded_users
+        )
+
+        users, total = await user_repo.get_multi_with_total(db_session, skip=10, limit=10)
+
+        assert users == []
+        assert total == len(seeded_users) + 1
+
+    async def test_get_multi_with_total_columns(
+        self, db_session: AsyncSession, seeded_users: list[dict]
+    ) -> None:
+        """测试只查询部分列时单次查询获取用户列表及总数。"""
+        from app.crud.user_repo import user_repo
+        from app.models.user import User
+
+        columns = (User.email, User.username)
+        rows, total = await user_repo.get_multi_with_total(
+            db_session, skip=0, limit=10, columns=columns
+        )
+
+        assert total == len(seeded_users)
+        assert sorted(row.email for row in rows) == sorted(
+            seeded_user["email"] for seeded_user in seeded_users
+        )
+
+        rows, total = await user_repo.get_multi_with_total(
+            db_session, skip=10, limit=10, columns=columns
+        )
+
+        assert rows == []
+        assert total == len(seeded_users)
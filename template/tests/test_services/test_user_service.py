@@ -1,33 +1,230 @@
 """用户服务测试。"""
+import asyncio
+import uuid
+from contextlib import AsyncExitStack
+from typing import Any
+
 import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
+
+from app.crud.user_repo import user_repo
+from app.exceptions import ResourceNotFoundException, ValidationException
+from app.schemas.user import UserCreate
+from app.services.user_service import UserService
+
+# 不存在的用户 ID
+MISSING_USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000000")
+
+
+async def _raw_exists(conn: AsyncConnection, user_id: uuid.UUID) -> bool:
+    """通过驱动层 SQL 检查用户是否存在，不经过 ORM 的查询构建和结果映射。
+
+    Args:
+        conn: 数据库连接。
+        user_id: 用户 ID。
+
+    Returns:
+        用户是否存在。
+    """
+    result = await conn.exec_driver_sql("SELECT 1 FROM users WHERE id = $1", (user_id,))
+    return result.first() is not None
+
+
+async def _expect_not_found(session: AsyncSession, user_id: uuid.UUID) -> ResourceNotFoundException:
+    """确认用户不存在，并获取服务层抛出的异常。
+
+    Args:
+        session: 数据库会话。
+        user_id: 不存在的用户 ID。
+
+    Returns:
+        服务层抛出的资源不存在异常。
+    """
+    assert not await _raw_exists(await session.connection(), user_id)
+
+    try:
+        await UserService.get_user(session, user_id=user_id)
+    except ResourceNotFoundException as exc:
+        return exc
+    pytest.fail("获取不存在的用户时未抛出 ResourceNotFoundException")
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def _warmup_user_service(
+    seeded_users: list[dict[str, Any]],
+    db_session_maker: async_sessionmaker[AsyncSession],
+) -> None:
+    """在本模块的第一个测试之前预热用户服务的查询路径。
+
+    首次调用需要编译 SQL 语句并填充 SQLAlchemy 的编译缓存和连接上的预处理语句缓存，
+    预热后这部分一次性开销不再计入第一个测试的耗时。
+
+    Args:
+        seeded_users: 种子用户列表。
+        db_session_maker: 测试会话工厂。
+    """
+    async with db_session_maker() as session:
+        await UserService.get_users(session, skip=0, limit=1)
+        await UserService.get_user(session, user_id=seeded_users[0]["id"])
+
+
+@pytest_asyncio.fixture(scope="session")
+async def user_service_results(
+    seeded_users: list[dict[str, Any]],
+    db_session_maker: async_sessionmaker[AsyncSession],
+) -> dict[str, Any]:
+    """并发执行只读的用户服务调用，结果在整个测试会话中共享。
+
+    各调用互不依赖，各自使用独立的会话和连接，通过 `asyncio.gather` 并发执行，
+    等待时间取决于最慢的一个调用而不是各调用之和。只读取种子用户，不受其他测试影响。
+
+    Args:
+        seeded_users: 种子用户列表。
+        db_session_maker: 测试会话工厂。
+
+    Returns:
+        各服务调用的结果。
+    """
+    async with AsyncExitStack() as stack:
+        sessions = [
+            await stack.enter_async_context(db_session_maker())
+            for _ in range(4)
+        ]
+        user, page_data, not_found, user_count = await asyncio.gather(
+            UserService.get_user(sessions[0], user_id=seeded_users[0]["id"]),
+            UserService.get_users(sessions[1], skip=0, limit=10, with_total=True),
+            _expect_not_found(sessions[2], MISSING_USER_ID),
+            user_repo.count(sessions[3]),
+        )
+    return {
+        "user": user,
+        "page_data": page_data,
+        "not_found": not_found,
+        "user_count": user_count,
+    }
 
 
 @pytest.mark.asyncio
-class TestUserService:
-    """用户服务测试类。"""
+@pytest.mark.parametrize(
+    ("result_key", "expected_found"),
+    [("user", True), ("not_found", False)],
+    ids=["found", "missing"],
+)
+async def test_get_user_lookup(
+    user_service_results: dict[str, Any],
+    seeded_users: list[dict],
+    result_key: str,
+    expected_found: bool,
+) -> None:
+    """测试获取存在和不存在的用户。"""
+    result = user_service_results[result_key]
 
-    async def test_get_user(self, db_session: AsyncSession, test_user: dict) -> None:
-        """测试获取用户。"""
-        from app.services.user_service import UserService
+    if expected_found:
+        assert {"email": result.email, "username": result.username} == {
+            "email": seeded_users[0]["email"],
+            "username": seeded_users[0]["username"],
+        }
+    else:
+        assert isinstance(result, ResourceNotFoundException)
 
-        user = await UserService.get_user(db_session, user_id=test_user["id"])
 
-        assert user.email == test_user["email"]
-        assert user.username == test_user["username"]
+@pytest.mark.asyncio
+async def test_get_user_uses_identity_map(
+    db_engine: AsyncEngine, db_session: AsyncSession, test_user: dict
+) -> None:
+    """测试同一会话中重复获取用户时直接命中标识映射，不执行 SQL。"""
+    # 端点传入的是字符串 ID，需要先转为 UUID 才能命中标识映射
+    user_id = str(test_user["id"])
+    user = await UserService.get_user(db_session, user_id=user_id)
+
+    statements: list[str] = []
 
-    async def test_get_user_not_found(self, db_session: AsyncSession) -> None:
-        """测试获取不存在的用户。"""
-        from app.services.user_service import UserService
-        from app.exceptions import ResourceNotFoundException
+    def _record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
 
-        with pytest.raises(ResourceNotFoundException):
-            await UserService.get_user(db_session, user_id="00000000-0000-0000-0000-000000000000")
+    event.listen(db_engine.sync_engine, "before_cursor_execute", _record_statement)
+    try:
+        cached_user = await UserService.get_user(db_session, user_id=user_id)
+    finally:
+        event.remove(db_engine.sync_engine, "before_cursor_execute", _record_statement)
 
-    async def test_get_users(self, db_session: AsyncSession) -> None:
-        """测试获取用户列表。"""
-        from app.services.user_service import UserService
+    assert cached_user is user
+    assert statements == []
 
-        page_data = await UserService.get_users(db_session, skip=0, limit=10)
 
-        assert page_data.items is not None
-        assert page_data.meta.total >= 0
+@pytest.mark.asyncio
+async def test_get_user_invalid_id(db_session: AsyncSession) -> None:
+    """测试无法解析的用户 ID 视为用户不存在。"""
+    with pytest.raises(ResourceNotFoundException):
+        await UserService.get_user(db_session, user_id="not-a-uuid")
+
+
+@pytest.mark.asyncio
+async def test_get_users(user_service_results: dict[str, Any], seeded_users: list[dict]) -> None:
+    """测试获取用户列表。"""
+    page_data = user_service_results["page_data"]
+
+    assert len(page_data.items) == len(seeded_users)
+    assert page_data.meta.total == len(seeded_users)
+
+
+@pytest.mark.asyncio
+async def test_count_users(user_service_results: dict[str, Any], seeded_users: list[dict]) -> None:
+    """测试统计用户总数。"""
+    assert user_service_results["user_count"] == len(seeded_users)
+
+
+@pytest.mark.asyncio
+async def test_get_users_without_total(db_session: AsyncSession) -> None:
+    """测试不统计总数时获取用户列表。"""
+    page_data = await UserService.get_users(db_session, skip=0, limit=10)
+
+    assert page_data.meta.total is None
+    assert page_data.meta.pages is None
+    assert page_data.meta.has_next is False
+
+
+@pytest.mark.asyncio
+async def test_get_users_with_cursor(db_session: AsyncSession, seeded_users: list[dict]) -> None:
+    """测试使用游标分页获取用户列表。"""
+    for i in range(3):
+        await user_repo.create(
+            db_session,
+            obj_in=UserCreate(
+                email=f"cursor{i}@example.com",
+                username=f"cursoruser{i}",
+                password="Password123!",
+            ),
+        )
+    await db_session.commit()
+
+    first_page = await UserService.get_users(db_session, limit=2)
+
+    assert len(first_page.items) == 2
+    assert first_page.meta.has_next is True
+    assert first_page.meta.next_cursor is not None
+
+    # 沿游标翻完所有页，每个用户恰好出现一次
+    user_ids = [user.id for user in first_page.items]
+    cursor = first_page.meta.next_cursor
+    while cursor is not None:
+        page_data = await UserService.get_users(db_session, limit=2, cursor=cursor)
+        assert page_data.meta.has_prev is True
+        user_ids.extend(user.id for user in page_data.items)
+        cursor = page_data.meta.next_cursor
+
+    assert len(user_ids) == len(set(user_ids)) == len(seeded_users) + 3
+
+
+@pytest.mark.asyncio
+async def test_get_users_invalid_cursor(db_session: AsyncSession) -> None:
+    """测试使用无效游标获取用户列表。"""
+    with pytest.raises(ValidationException):
+        await UserService.get_users(db_session, cursor="not-a-cursor")